@@ -0,0 +1,224 @@
+# File: assets.py
+# Description: Builds the minified, fingerprinted and precompressed static
+#              assets of the Project Management application.
+# Date: 2026/10/18
+
+''' Builds the static assets of the Project Management application for
+    long-lived caching. Each style sheet and script is minified and written
+    under a name that includes a digest of its content, such as
+    ``style.3f2a9c1b7e4d.css``, with gzip and, if the brotli module is
+    installed, brotli compressed copies beside it. A manifest maps the
+    source names to the built names. Since a changed asset gets a new name,
+    browsers can cache the built assets for as long as they like. '''
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+
+try:
+    import brotli
+except(ImportError):
+    brotli = None
+
+#: (str): The name of the manifest file in the build folder.
+MANIFEST_NAME = 'manifest.json'
+
+#: (int): The seconds browsers may cache a built asset (a year).
+MAX_AGE = 31536000
+
+#: The compressed copies written beside each built asset, as
+#: (Content-Encoding, file suffix) tuples in order of preference.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+def _strip_comments(text, line_comments):
+    ''' Removes the comments from a style sheet or script, leaving the
+        content of string literals alone.
+        
+        Args:
+            text (str): The style sheet or script.
+            
+            line_comments (bool): Whether or not // starts a comment that
+            ends with the line.
+        
+        Returns:
+            (str): The text without comments. '''
+    
+    output = []
+    position = 0
+    quote = None
+    
+    while position < len(text):
+        character = text[position]
+        
+        if quote:
+            output.append(character)
+            
+            if character == '\\':
+                output.append(text[position + 1:position + 2])
+                position += 1
+            elif character == quote:
+                quote = None
+        elif character in '"\'':
+            quote = character
+            output.append(character)
+        elif text.startswith('/*', position):
+            end = text.find('*/', position + 2)
+            position = len(text) if end == -1 else end + 1
+        elif line_comments and text.startswith('//', position):
+            end = text.find('\n', position)
+            position = len(text) if end == -1 else end - 1
+        else:
+            output.append(character)
+        
+        position += 1
+    
+    return ''.join(output)
+
+def minify_css(text):
+    ''' Minifies a style sheet by removing its comments and the whitespace
+        that does not separate values.
+        
+        Args:
+            text (str): The style sheet.
+        
+        Returns:
+            (str): The minified style sheet. '''
+    
+    text = _strip_comments(text, False)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{}:;,>])\s*', r'\1', text)
+    
+    return text.replace(';}', '}').strip()
+
+def minify_js(text):
+    ''' Minifies a script by removing its comments, indentation and blank
+        lines. Line breaks are kept, since the script relies on them to end
+        some statements. Regular expression literals are not recognized,
+        so a script must not use one that contains // or /*.
+        
+        Args:
+            text (str): The script.
+        
+        Returns:
+            (str): The minified script. '''
+    
+    lines = _strip_comments(text, True).splitlines()
+    
+    return '\n'.join(line.strip() for line in lines if line.strip())
+
+#: The minifier of each asset type, by file extension.
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js
+    }
+
+def _gzip(data):
+    ''' Compresses an asset with gzip. The header does not include the time,
+        so the same asset is always compressed to the same bytes. '''
+    
+    buffer = io.BytesIO()
+    
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9,
+                       mtime=0) as file:
+        file.write(data)
+    
+    return buffer.getvalue()
+
+def _write(path, data):
+    ''' Writes a file, unless the file already has the data. '''
+    
+    if os.path.exists(path):
+        with open(path, 'rb') as file:
+            if file.read() == data:
+                return
+    
+    with open(path, 'wb') as file:
+        file.write(data)
+
+def build_assets(source_folder, build_folder):
+    ''' Builds every style sheet and script in a folder. The built assets of
+        earlier builds are kept, so pages rendered before a build still
+        load the assets they name.
+        
+        Args:
+            source_folder (str): The folder of the style sheets and scripts.
+            
+            build_folder (str): The folder to write the built assets and the
+            manifest to. It is created if it does not exist.
+        
+        Returns:
+            A dict of the built name of each asset, by source name. '''
+    
+    os.makedirs(build_folder, exist_ok=True)
+    manifest = {}
+    
+    for name in sorted(os.listdir(source_folder)):
+        stem, extension = os.path.splitext(name)
+        minify = MINIFIERS.get(extension)
+        
+        if minify is None:
+            continue
+        
+        with open(os.path.join(source_folder, name), encoding='utf-8') as file:
+            data = minify(file.read()).encode('utf-8')
+        
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        built_name = '%s.%s%s' % (stem, digest, extension)
+        path = os.path.join(build_folder, built_name)
+        
+        _write(path, data)
+        _write(path + '.gz', _gzip(data))
+        
+        if brotli is not None:
+            _write(path + '.br', brotli.compress(data, quality=11))
+        
+        manifest[name] = built_name
+    
+    _write(os.path.join(build_folder, MANIFEST_NAME),
+           json.dumps(manifest, indent=4, sort_keys=True).encode('utf-8'))
+    
+    return manifest
+
+def load_manifest(build_folder):
+    ''' Loads the manifest of the built assets.
+    
+        Args:
+            build_folder (str): The folder the assets were built in.
+        
+        Returns:
+            A dict of the built name of each asset, by source name.
+            
+            An empty dict if the assets have not been built. '''
+    
+    try:
+        with open(os.path.join(build_folder, MANIFEST_NAME),
+                  encoding='utf-8') as file:
+            return json.load(file)
+    except(EnvironmentError, ValueError):
+        return {}
+
+def choose_encoding(build_folder, built_name, accept_encodings):
+    ''' Chooses the compressed copy of a built asset to send.
+    
+        Args:
+            build_folder (str): The folder the assets were built in.
+            
+            built_name (str): The built name of the asset.
+            
+            accept_encodings: The Accept-Encoding header of the request, as
+            a :class:`werkzeug.datastructures.Accept`.
+        
+        Returns:
+            A (file name, Content-Encoding) tuple. The Content-Encoding is
+            None if the asset is sent uncompressed. '''
+    
+    for encoding, suffix in ENCODINGS:
+        if (accept_encodings.quality(encoding) > 0 and
+                os.path.exists(os.path.join(build_folder,
+                                            built_name + suffix))):
+            return built_name + suffix, encoding
+    
+    return built_name, None
@@ -0,0 +1,88 @@
+# File: bytecodecache.py
+# Description: Stores the compiled templates of the Project Management
+#              application on disk for the worker processes to share.
+# Date: 2026/10/18
+
+''' Stores the compiled Jinja templates of the Project Management
+    application on disk, so a worker process that starts after a deploy
+    or a recycle loads the bytecode instead of compiling every template on
+    its first requests. '''
+
+import hashlib
+import jinja2
+import os
+import tempfile
+
+class SharedBytecodeCache(jinja2.FileSystemBytecodeCache):
+    ''' A :class:`jinja2.FileSystemBytecodeCache` that the worker processes
+        can share.
+        
+        * The cache files are written to a temporary file and renamed, so a
+          worker never reads a file that another worker is writing.
+        
+        * The cache files are keyed by the template name alone, so a cache
+          warmed in the build directory is used from the directory the
+          application runs in. Jinja still compares the checksum of the
+          template source, so a changed template is compiled again.
+        
+        * A cache file that cannot be read or written is treated as a miss,
+          so a read-only or full disk only costs the compile time. '''
+    
+    def get_cache_key(self, name, filename=None):
+        ''' Provides the key of a template's cache file.
+        
+            Args:
+                name (str): The name of the template.
+                
+                filename (str): The path of the template, which is ignored.
+            
+            Returns:
+                (str): The key. '''
+        
+        return hashlib.sha1(name.encode('utf-8')).hexdigest()
+    
+    def load_bytecode(self, bucket):
+        ''' Loads a template's bytecode into a bucket, if it is cached.'''
+        
+        try:
+            super().load_bytecode(bucket)
+        except(EnvironmentError, EOFError, ValueError, TypeError):
+            bucket.reset()
+    
+    def dump_bytecode(self, bucket):
+        ''' Stores a bucket's bytecode.'''
+        
+        try:
+            handle, temporary_name = tempfile.mkstemp(
+                suffix='.tmp', dir=self.directory)
+        except(EnvironmentError):
+            return
+        
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                bucket.write_bytecode(file)
+            
+            os.replace(temporary_name, self._get_cache_filename(bucket))
+        except(EnvironmentError):
+            try:
+                os.remove(temporary_name)
+            except(EnvironmentError):
+                pass
+
+def compile_templates(environment):
+    ''' Loads every template of an environment, which compiles the templates
+        that are not in its bytecode cache and stores them there.
+        
+        Args:
+            environment (:class:`jinja2.Environment`): The environment to
+            load the templates of.
+        
+        Returns:
+            ([str]): The names of the templates. '''
+    
+    names = environment.list_templates()
+    
+    for name in names:
+        environment.get_template(name)
+    
+    return names
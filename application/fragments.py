@@ -0,0 +1,314 @@
+# File: fragments.py
+# Description: Caches rendered HTML fragments of the Project Management
+#              application's pages.
+# Date: 2026/10/18
+
+''' Caches rendered HTML fragments, such as the task table of a project
+    and the project list, so that repeated views skip the template loops.
+    
+    Fragment keys are tuples that start with a scope, such as
+    ``('project', 5)`` or ``('projects',)``, and include the version stamp
+    of the data the fragment shows. A write changes the version, so every
+    process stops reading the old fragments; the write paths of
+    :class:`database.CachingDatabase` also drop the fragments of the scope
+    from this process's cache right away. '''
+
+from abc import ABCMeta, abstractmethod
+from datetime import datetime
+import collections
+import hashlib
+import math
+import sys
+import threading
+import time
+
+class FragmentBackend:
+    ''' Abstract base class specifying the interface of the stores of the 
+        rendered fragments of a :class:`FragmentCache`. '''
+    
+    __metaclass__ = ABCMeta
+    
+    @abstractmethod
+    def get(self, key):
+        ''' Looks up a fragment.
+        
+            Args:
+                key (tuple): The key of the fragment.
+            
+            Returns:
+                (str): The fragment.
+                
+                None if the fragment is not stored or has expired.'''
+        
+        return NotImplemented
+    
+    @abstractmethod
+    def set(self, key, fragment, time_to_live):
+        ''' Stores a fragment.
+        
+            Args:
+                key (tuple): The key of the fragment.
+                
+                fragment (str): The rendered fragment.
+                
+                time_to_live (float): The number of seconds the fragment
+                stays stored.'''
+        
+        return NotImplemented
+    
+    @abstractmethod
+    def delete_prefix(self, prefix):
+        ''' Deletes every fragment whose key starts with a prefix, if the
+            backend can.
+            
+            Args:
+                prefix (tuple): The first items of the keys to delete.'''
+        
+        return NotImplemented
+    
+    @abstractmethod
+    def statistics(self):
+        ''' Provides the backend metrics.
+        
+            Returns:
+                A dict of the metrics the backend keeps.'''
+        
+        return NotImplemented
+
+class MemoryFragmentBackend(FragmentBackend):
+    ''' Stores fragments in the memory of the process, evicting the least
+        recently used fragments to stay within a memory budget. '''
+    
+    def __init__(self, max_bytes=8388608):
+        ''' Constructor
+        
+            Args:
+                max_bytes (int): The memory the fragments may take. '''
+        
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be positive')
+        
+        #: (int): The memory the fragments may take.
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        
+        # key: (fragment, size, expiry time) with the most recently used at
+        # the end
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+    
+    def get(self, key):
+        ''' Looks up a fragment (see :meth:`FragmentBackend.get`).'''
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry is None:
+                return None
+            
+            if entry[2] <= time.monotonic():
+                self._remove(key)
+                return None
+            
+            self._entries.move_to_end(key)
+        
+        return entry[0]
+    
+    def set(self, key, fragment, time_to_live):
+        ''' Stores a fragment, evicting the least recently used fragments
+            until it fits. A fragment larger than the budget is not
+            stored.'''
+        
+        size = sys.getsizeof(fragment)
+        
+        if size > self.max_bytes:
+            return
+        
+        entry = (fragment, size, time.monotonic() + time_to_live)
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = entry
+            self._bytes += size
+            
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+    
+    def delete_prefix(self, prefix):
+        ''' Deletes every fragment whose key starts with a prefix.'''
+        
+        length = len(prefix)
+        
+        with self._lock:
+            for key in [key for key in self._entries
+                        if key[:length] == prefix]:
+                self._remove(key)
+    
+    def _remove(self, key):
+        ''' Removes a stored fragment. The lock must be held.'''
+        
+        self._bytes -= self._entries.pop(key)[1]
+    
+    def statistics(self):
+        ''' Provides the number of fragments, the memory they take and the
+            evictions since the backend was created.'''
+        
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions
+                }
+
+class MemcachedFragmentBackend(FragmentBackend):
+    ''' Stores fragments in memcached, so that every worker process shares
+        them. '''
+    
+    def __init__(self, client):
+        ''' Constructor
+        
+            Args:
+                client: A memcached client with get(key) and
+                set(key, value, time) methods, such as
+                ``memcache.Client`` from python-memcached.'''
+        
+        #: The memcached client.
+        self.client = client
+    
+    def _key(self, key):
+        ''' Converts a fragment key to a memcached key, which is limited to
+            250 characters without spaces.'''
+        
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        
+        return 'fragment:' + digest
+    
+    def get(self, key):
+        ''' Looks up a fragment (see :meth:`FragmentBackend.get`).'''
+        
+        return self.client.get(self._key(key))
+    
+    def set(self, key, fragment, time_to_live):
+        ''' Stores a fragment (see :meth:`FragmentBackend.set`). memcached
+            counts the time to live in whole seconds.'''
+        
+        self.client.set(self._key(key), fragment,
+                        time=max(1, int(math.ceil(time_to_live))))
+    
+    def delete_prefix(self, prefix):
+        ''' Does nothing, since memcached cannot find keys by prefix. The
+            fragments of an old version are not read again and expire.'''
+        
+        pass
+    
+    def statistics(self):
+        ''' Provides no metrics, since memcached keeps its own.'''
+        
+        return {}
+
+class FragmentCache:
+    ''' Renders fragments on a miss and answers repeated renders from a
+        :class:`FragmentBackend`, counting the hits and misses. '''
+    
+    def __init__(self, backend, time_to_live=300.0, namespace=''):
+        ''' Constructor
+        
+            Args:
+                backend (:class:`FragmentBackend`): Stores the fragments.
+                
+                time_to_live (float): The longest time, in seconds, a
+                fragment stays cached.
+                
+                namespace (str): Added to every key, such as the version of
+                the templates, so that fragments rendered by another
+                deployment are not used. '''
+        
+        #: (:class:`FragmentBackend`): Stores the fragments.
+        self.backend = backend
+        
+        #: (float): The longest time, in seconds, a fragment stays cached.
+        self.time_to_live = time_to_live
+        
+        #: (str): Added to every key.
+        self.namespace = namespace
+        
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get_or_render(self, key, render, expires_at=None):
+        ''' Returns a cached fragment, or renders and caches it.
+        
+            Args:
+                key (tuple): The key of the fragment. It starts with the
+                scope of the fragment and includes the version of the data
+                it shows.
+                
+                render (callable): Renders the fragment.
+                
+                expires_at (datetime): When the fragment goes out of date
+                without a write, such as when the next task shown in it
+                becomes past due. None if only a write changes it.
+            
+            Returns:
+                (str): The rendered fragment. '''
+        
+        key = (self.namespace,) + tuple(key)
+        fragment = self.backend.get(key)
+        
+        with self._lock:
+            if fragment is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        
+        if fragment is not None:
+            return fragment
+        
+        fragment = str(render())
+        time_to_live = self.time_to_live
+        
+        if expires_at is not None:
+            time_to_live = min(time_to_live,
+                               (expires_at - datetime.now()).total_seconds())
+        
+        # A fragment that is already out of date is not cached.
+        if time_to_live > 0:
+            self.backend.set(key, fragment, time_to_live)
+        
+        return fragment
+    
+    def invalidate(self, scope):
+        ''' Drops the fragments of a scope, such as ``('project', 5)``,
+            if the backend can.
+            
+            Args:
+                scope (tuple): The first items of the fragment keys. '''
+        
+        self.backend.delete_prefix((self.namespace,) + tuple(scope))
+    
+    def statistics(self):
+        ''' Provides the cache metrics.
+        
+            Returns:
+                A dict with the hits, misses and hit ratio since the cache
+                was created and the metrics of the backend.'''
+        
+        with self._lock:
+            lookups = self._hits + self._misses
+            statistics = {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'time_to_live': self.time_to_live
+                }
+        
+        statistics.update(self.backend.statistics())
+        
+        return statistics
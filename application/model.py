@@ -9,6 +9,14 @@
 
 from datetime import datetime
 from enum import Enum
+from . import passwords
+import itertools
+
+try:
+    import numpy
+except(ImportError):
+    # NumPy is only needed for TaskFrame.
+    numpy = None
 
 class Complexity(Enum):
     ''' Represents the task complexity.'''
@@ -35,9 +43,27 @@ class Status(Enum):
     #: The task has been completed.
     COMPLETE = 'Complete'
 
+#: ({str: Complexity}): The complexities keyed by their stored values.
+COMPLEXITY_BY_VALUE = {complexity.value: complexity 
+                       for complexity in Complexity}
+
+#: ({str: Status}): The statuses keyed by their stored values.
+STATUS_BY_VALUE = {status.value: status for status in Status}
+
+#: ({str: int}): The TaskFrame codes of the complexities keyed by their 
+#: stored values.
+COMPLEXITY_CODES = {complexity.value: code 
+                    for code, complexity in enumerate(Complexity)}
+
+#: ({str: int}): The TaskFrame codes of the statuses keyed by their stored 
+#: values.
+STATUS_CODES = {status.value: code for code, status in enumerate(Status)}
+
 class Project:
     ''' Represents a project.'''
     
+    __slots__ = ('_id', '_name', '_brief_description', '_description')
+    
     def __init__(self):
         ''' Constructor'''
         self._id = 0 
@@ -45,6 +71,27 @@ class Project:
         self._brief_description = ''
         self._description = ''
     
+    @classmethod
+    def from_row(cls, row):
+        ''' Creates a project from a database row without validating it. 
+            Only use it for data read from the database, which the schema 
+            already constrains.
+            
+            Args:
+                row (tuple): The id, name, brief_description and 
+                description columns of a project.
+            
+            Returns:
+                A :class:`Project` object. '''
+        
+        project = cls.__new__(cls)
+        project._id = row[0]
+        project._name = row[1]
+        project._brief_description = row[2]
+        project._description = row[3]
+        
+        return project
+    
     @property
     def id(self):
         ''' (int): The non-negative id of the project in the database. '''
@@ -105,6 +152,9 @@ class Project:
 class Task:
     ''' Represents a task.'''
     
+    __slots__ = ('_id', '_project_id', '_name', '_brief_description', 
+                 '_description', '_complexity', '_due_date', '_status')
+    
     def __init__(self):
         ''' Constructor'''
         
@@ -116,7 +166,35 @@ class Task:
         self._complexity = Complexity.LOW
         self._due_date = datetime.now()
         self._status = Status.NOT_STARTED
-        
+    
+    @classmethod
+    def from_row(cls, row):
+        ''' Creates a task from a database row without validating it. 
+            Only use it for data read from the database, which the schema 
+            already constrains. The complexity and status are looked up in 
+            :data:`COMPLEXITY_BY_VALUE` and :data:`STATUS_BY_VALUE`, and 
+            are UNKNOWN if the stored value is not known.
+            
+            Args:
+                row (tuple): The id, project_id, name, brief_description, 
+                description, complexity, due_date and status columns of a 
+                task.
+            
+            Returns:
+                A :class:`Task` object. '''
+        
+        task = cls.__new__(cls)
+        task._id = row[0]
+        task._project_id = row[1]
+        task._name = row[2]
+        task._brief_description = row[3]
+        task._description = row[4]
+        task._complexity = COMPLEXITY_BY_VALUE.get(row[5], Complexity.UNKNOWN)
+        task._due_date = row[6]
+        task._status = STATUS_BY_VALUE.get(row[7], Status.UNKNOWN)
+        
+        return task
+    
     @property
     def id(self):
         ''' (int): The non-negative id of the task in the database. '''
@@ -248,16 +326,435 @@ class Task:
         return self.due_date < datetime.now() and self.status != Status.COMPLETE
 
 
+class Page:
+    ''' Represents one page of an ordered list of projects or tasks.'''
+    
+    def __init__(self, items, has_previous, has_next):
+        ''' Constructor'''
+        
+        #: ([]): The projects or tasks on the page.
+        self.items = items
+        
+        #: (bool): Whether or not there is a page before this page.
+        self.has_previous = has_previous
+        
+        #: (bool): Whether or not there is a page after this page.
+        self.has_next = has_next
+    
+    @property
+    def first(self):
+        ''' The first item on the page. None if the page is empty. '''
+        
+        return self.items[0] if self.items else None
+    
+    @property
+    def last(self):
+        ''' The last item on the page. None if the page is empty. '''
+        
+        return self.items[-1] if self.items else None
+
+
+class SearchResult:
+    ''' Represents a project or task found by a search. Only the summary 
+        columns are loaded.'''
+    
+    def __init__(self):
+        ''' Constructor'''
+        
+        #: (str): 'project' or 'task'.
+        self.kind = ''
+        
+        #: (int): The id of the project or task.
+        self.id = 0
+        
+        #: (int): The id of the project, or of the project the task 
+        #: belongs to.
+        self.project_id = 0
+        
+        #: (str): The name of the project or task.
+        self.name = ''
+        
+        #: (str): The brief description of the project or task.
+        self.brief_description = ''
+        
+        #: (float): How well the project or task matches the search. 
+        #: Higher is better.
+        self.rank = 0.0
+
+class ProjectStatistics:
+    ''' Represents the task statistics of a project.'''
+    
+    def __init__(self):
+        ''' Constructor'''
+        
+        #: (int): The number of tasks with low complexity.
+        self.low_complexity_count = 0
+        
+        #: (int): The number of tasks with medium complexity.
+        self.medium_complexity_count = 0
+        
+        #: (int): The number of tasks with high complexity.
+        self.high_complexity_count = 0
+        
+        #: (int): The number of tasks that have not been started.
+        self.not_started_count = 0
+        
+        #: (int): The number of tasks that are in-progress.
+        self.in_progress_count = 0
+        
+        #: (int): The number of tasks that have been completed.
+        self.complete_count = 0
+        
+        #: (int): The number of tasks that are not past due.
+        self.on_time_count = 0
+        
+        #: (int): The number of tasks that are past due.
+        self.past_due_count = 0
+        
+        #: (datetime): The earliest due date of the tasks that are not 
+        #: complete. None if every task is complete.
+        self.earliest_open_due_date = None
+    
+    @property
+    def task_count(self):
+        ''' (int): The number of tasks in the project. '''
+        
+        return self.on_time_count + self.past_due_count
+
+
+class VersionStamp:
+    ''' Represents the version of a project, or of the project list, which 
+        is loaded instead of the data to answer a conditional request.'''
+    
+    def __init__(self):
+        ''' Constructor'''
+        
+        #: (int): Changes whenever the project or one of its tasks is 
+        #: written.
+        self.version = 0
+        
+        #: (datetime): When the project or one of its tasks was last 
+        #: written.
+        self.updated_at = None
+        
+        #: (datetime): The latest due date of the tasks that are not 
+        #: complete which has passed. None if no such task is past due.
+        self.last_past_due_date = None
+        
+        #: (datetime): The earliest due date of the tasks that are not 
+        #: complete which has not passed yet. None if there is none.
+        self.next_due_date = None
+    
+    @property
+    def etag(self):
+        ''' (str): Identifies the data of a page. Tasks become past due 
+            without a write, so the next due date is part of the tag and 
+            the tag changes once that date passes. '''
+        
+        if self.next_due_date is None:
+            return str(self.version)
+        
+        return '%d-%s' % (self.version, 
+                          self.next_due_date.strftime('%Y%m%d%H%M%S%f'))
+    
+    @property
+    def last_modified(self):
+        ''' (datetime): When the data of a page last changed: the last 
+            write, or the last time a task became past due. '''
+        
+        if (self.last_past_due_date is not None and 
+                self.last_past_due_date > self.updated_at):
+            return self.last_past_due_date
+        
+        return self.updated_at
+
+
+class TaskFrame:
+    ''' Holds the columns of many tasks in typed NumPy arrays, so that 
+        portfolio reports are computed with vectorized operations instead 
+        of one :class:`Task` at a time. Only the columns needed for 
+        analysis are kept; names and descriptions are not. Requires NumPy.
+        
+        The complexities and statuses are stored as int8 codes, which are 
+        the indexes of the members in :attr:`COMPLEXITIES` and 
+        :attr:`STATUSES`. '''
+    
+    #: ((Complexity)): The complexities indexed by their codes.
+    COMPLEXITIES = tuple(Complexity)
+    
+    #: ((Status)): The statuses indexed by their codes.
+    STATUSES = tuple(Status)
+    
+    def __init__(self, ids, project_ids, complexities, statuses, due_dates):
+        ''' Constructor
+        
+            Args:
+                ids ([int]): The task ids.
+                
+                project_ids ([int]): The project ids of the tasks.
+                
+                complexities ([int]): The complexity codes of the tasks.
+                
+                statuses ([int]): The status codes of the tasks.
+                
+                due_dates ([datetime]): The due dates of the tasks.
+            
+            Raises:
+                ImportError: NumPy is not installed. '''
+        
+        if numpy is None:
+            raise ImportError('TaskFrame requires NumPy.')
+        
+        #: (numpy.ndarray): The task ids (int64).
+        self.ids = numpy.asarray(ids, dtype=numpy.int64)
+        
+        #: (numpy.ndarray): The project ids of the tasks (int64).
+        self.project_ids = numpy.asarray(project_ids, dtype=numpy.int64)
+        
+        #: (numpy.ndarray): The complexity codes of the tasks (int8).
+        self.complexities = numpy.asarray(complexities, dtype=numpy.int8)
+        
+        #: (numpy.ndarray): The status codes of the tasks (int8).
+        self.statuses = numpy.asarray(statuses, dtype=numpy.int8)
+        
+        #: (numpy.ndarray): The due dates of the tasks (datetime64[us]).
+        self.due_dates = numpy.asarray(due_dates, dtype='datetime64[us]')
+    
+    @classmethod
+    def from_rows(cls, rows, chunk_size=100000):
+        ''' Creates a task frame from database rows. The rows are 
+            converted in chunks, so an iterator over millions of rows 
+            never holds more than one chunk of them as Python objects.
+            
+            Args:
+                rows: An iterable of tuples with the id, project_id, 
+                complexity, status and due_date columns of a task. 
+                Unknown complexities and statuses become UNKNOWN.
+                
+                chunk_size (int): The number of rows converted at a time.
+            
+            Returns:
+                A :class:`TaskFrame`.
+            
+            Raises:
+                ImportError: NumPy is not installed. '''
+        
+        rows = iter(rows)
+        frames = []
+        
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            
+            if not chunk:
+                break
+            
+            ids, project_ids, complexities, statuses, due_dates = \
+                zip(*chunk)
+            
+            frames.append(cls(
+                ids, project_ids,
+                [COMPLEXITY_CODES.get(value, 0) for value in complexities],
+                [STATUS_CODES.get(value, 0) for value in statuses],
+                due_dates))
+        
+        return cls.concatenate(frames)
+    
+    @classmethod
+    def from_tasks(cls, tasks):
+        ''' Creates a task frame from :class:`Task` objects.
+        
+            Args:
+                tasks: An iterable of :class:`Task` objects.
+            
+            Returns:
+                A :class:`TaskFrame`.
+            
+            Raises:
+                ImportError: NumPy is not installed. '''
+        
+        return cls.from_rows((task.id, task.project_id, task.complexity.value,
+                              task.status.value, task.due_date)
+                             for task in tasks)
+    
+    @classmethod
+    def concatenate(cls, frames):
+        ''' Joins task frames into one.
+        
+            Args:
+                frames ([TaskFrame]): The task frames to join.
+            
+            Returns:
+                A :class:`TaskFrame` with the tasks of every frame, in 
+                order. It is empty if there are no frames.
+            
+            Raises:
+                ImportError: NumPy is not installed. '''
+        
+        if not frames:
+            return cls((), (), (), (), ())
+        
+        if len(frames) == 1:
+            return frames[0]
+        
+        return cls(numpy.concatenate([frame.ids for frame in frames]),
+                   numpy.concatenate([frame.project_ids for frame in frames]),
+                   numpy.concatenate([frame.complexities 
+                                      for frame in frames]),
+                   numpy.concatenate([frame.statuses for frame in frames]),
+                   numpy.concatenate([frame.due_dates for frame in frames]))
+    
+    def __len__(self):
+        ''' Returns the number of tasks in the frame. '''
+        
+        return len(self.ids)
+    
+    def complexity_mask(self, complexity):
+        ''' Finds the tasks with a complexity.
+        
+            Args:
+                complexity (:class:`Complexity`): The complexity.
+            
+            Returns:
+                A boolean array that is True for the tasks with the 
+                complexity. '''
+        
+        code = COMPLEXITY_CODES[Complexity(complexity).value]
+        
+        return self.complexities == code
+    
+    def status_mask(self, status):
+        ''' Finds the tasks with a status.
+        
+            Args:
+                status (:class:`Status`): The status.
+            
+            Returns:
+                A boolean array that is True for the tasks with the 
+                status. '''
+        
+        code = STATUS_CODES[Status(status).value]
+        
+        return self.statuses == code
+    
+    def past_due_mask(self, as_of=None):
+        ''' Finds the tasks that are past due, as defined by 
+            :meth:`Task.is_task_past_due`.
+            
+            Args:
+                as_of (datetime): The time to compare the due dates with. 
+                Defaults to now.
+            
+            Returns:
+                A boolean array that is True for the past due tasks. '''
+        
+        if as_of is None:
+            as_of = datetime.now()
+        
+        return ((self.due_dates < numpy.datetime64(as_of, 'us')) & 
+                ~self.status_mask(Status.COMPLETE))
+    
+    def count_by_project(self, mask=None):
+        ''' Counts the tasks of each project.
+        
+            Args:
+                mask (numpy.ndarray): A boolean array selecting the tasks 
+                to count, such as :meth:`past_due_mask`. Defaults to every 
+                task.
+            
+            Returns:
+                A tuple of two arrays: the sorted ids of the projects with 
+                at least one selected task, and the number of selected 
+                tasks of each. '''
+        
+        project_ids = self.project_ids if mask is None else \
+            self.project_ids[mask]
+        
+        return numpy.unique(project_ids, return_counts=True)
+    
+    def count_by_status(self, mask=None):
+        ''' Counts the tasks with each status.
+        
+            Args:
+                mask (numpy.ndarray): A boolean array selecting the tasks 
+                to count. Defaults to every task.
+            
+            Returns:
+                A {:class:`Status`: int} dictionary with every status. '''
+        
+        statuses = self.statuses if mask is None else self.statuses[mask]
+        counts = numpy.bincount(statuses, minlength=len(self.STATUSES))
+        
+        return dict(zip(self.STATUSES, counts.tolist()))
+    
+    def due_date_buckets(self, edges):
+        ''' Finds the due date bucket of every task.
+        
+            Args:
+                edges ([datetime]): The ascending dates where the buckets 
+                start.
+            
+            Returns:
+                An int array with the bucket of every task. Bucket 0 holds 
+                the tasks due before the first edge and bucket i holds the 
+                tasks due on or after edges[i - 1] and before edges[i]. '''
+        
+        edges = numpy.asarray(edges, dtype='datetime64[us]')
+        
+        return numpy.searchsorted(edges, self.due_dates, side='right')
+    
+    def count_by_due_date(self, edges, mask=None):
+        ''' Counts the tasks in each due date bucket (see 
+            :meth:`due_date_buckets`).
+            
+            Args:
+                edges ([datetime]): The ascending dates where the buckets 
+                start.
+                
+                mask (numpy.ndarray): A boolean array selecting the tasks 
+                to count. Defaults to every task.
+            
+            Returns:
+                An int array with len(edges) + 1 counts, one per bucket. '''
+        
+        buckets = self.due_date_buckets(edges)
+        
+        if mask is not None:
+            buckets = buckets[mask]
+        
+        return numpy.bincount(buckets, minlength=len(edges) + 1)
+
+
 class Login:
     ''' Represents a login.'''
     
+    __slots__ = ('_id', '_username', '_password')
+    
     def __init__(self):
         ''' Constructor'''
         
         self._id = 0
         self._username = ''
         self._password = ''
-        
+    
+    @classmethod
+    def from_row(cls, row):
+        ''' Creates a login from a database row without validating it. 
+            Only use it for data read from the database.
+            
+            Args:
+                row (tuple): The id, username and password columns of a 
+                login.
+            
+            Returns:
+                A :class:`Login` object. '''
+        
+        login = cls.__new__(cls)
+        login._id = row[0]
+        login._username = row[1]
+        login._password = row[2]
+        
+        return login
+    
     @property
     def id(self):
         ''' (int): The id of the user in the database. '''
@@ -304,10 +801,56 @@ class Login:
         
         self._password = value
     
-    def check_login(self, username, password):
+    def set_password(self, password, iterations=passwords.DEFAULT_ITERATIONS):
+        ''' Hashes a plaintext password with a new salt and stores the hash 
+            as the user's password.
+            
+            Args:
+                password (str): The plaintext password.
+                
+                iterations (int): The PBKDF2 iterations of the hash. '''
+        
+        self.password = passwords.hash_password(password, iterations)
+    
+    def needs_rehash(self, iterations=passwords.DEFAULT_ITERATIONS):
+        ''' Determines whether or not the stored password should be hashed 
+            again, because it is plaintext or has other iterations.
+            
+            Args:
+                iterations (int): The configured PBKDF2 iterations.
+            
+            Returns:
+                True -- The password should be hashed again.
+                False -- The hash is current. '''
+        
+        return passwords.needs_rehash(self.password, iterations)
+    
+    def check_login(self, username, password, verify=None):
+        ''' Checks a username and plaintext password against the login.
+            
+            Args:
+                username (str): The username to check.
+                
+                password (str): The plaintext password to check.
+                
+                verify (callable): Checks a password against the stored 
+                hash, such as :meth:`passwords.PasswordVerifier.verify`. 
+                Defaults to :func:`passwords.verify_password`, which hashes 
+                in the calling thread.
+            
+            Returns:
+                True -- The username and password are correct.
+                False -- The username or password is incorrect. '''
+        
         # No blank username or password allowed
         if username == '' or password == '':
             return False
         
-        return self.username == username and self.password == password
+        if self.username != username:
+            return False
+        
+        if verify is None:
+            verify = passwords.verify_password
+        
+        return verify(password, self.password)
 
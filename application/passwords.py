@@ -0,0 +1,218 @@
+# File: passwords.py
+# Description: Hashes and verifies the passwords of the Project Management
+#              application's logins.
+# Date: 2026/10/18
+
+''' Hashes and verifies the passwords of the Project Management
+    application's logins with salted PBKDF2-HMAC-SHA256. Hashes are stored
+    as ``pbkdf2_sha256$iterations$salt$hash``, with the salt and hash in
+    base64, so the cost of each hash is known when it is verified and can
+    be raised later. '''
+
+import base64
+import concurrent.futures
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+#: (str): The name of the hash algorithm stored with each hash.
+ALGORITHM = 'pbkdf2_sha256'
+
+#: (int): The PBKDF2 iterations used unless configured otherwise.
+#: ``projectmanagement.py -calibratepasswords`` picks a value for a target
+#: verification time.
+DEFAULT_ITERATIONS = 100000
+
+#: (int): The number of random bytes in each salt.
+SALT_SIZE = 16
+
+def _pbkdf2(password, salt, iterations):
+    ''' Derives the hash of a password. hashlib releases the GIL while it
+        derives the hash, so other threads keep running. '''
+    
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt,
+                               iterations)
+
+def hash_password(password, iterations=DEFAULT_ITERATIONS):
+    ''' Hashes a password with a new random salt.
+    
+        Args:
+            password (str): The plaintext password.
+            
+            iterations (int): The PBKDF2 iterations. More iterations take
+            longer to verify and to guess.
+        
+        Returns:
+            (str): The hash to store, which includes the algorithm,
+            iterations and salt. '''
+    
+    salt = os.urandom(SALT_SIZE)
+    digest = _pbkdf2(password, salt, iterations)
+    
+    return '%s$%d$%s$%s' % (ALGORITHM, iterations,
+                            base64.b64encode(salt).decode('ascii'),
+                            base64.b64encode(digest).decode('ascii'))
+
+def _parse_hash(password_hash):
+    ''' Splits a stored hash into its iterations, salt and digest.
+    
+        Returns:
+            An (iterations, salt, digest) tuple.
+            
+            None if the value is not a hash made by :func:`hash_password`,
+            such as a plaintext password stored before passwords were
+            hashed. '''
+    
+    parts = password_hash.split('$')
+    
+    if len(parts) != 4 or parts[0] != ALGORITHM:
+        return None
+    
+    try:
+        return (int(parts[1]), base64.b64decode(parts[2]),
+                base64.b64decode(parts[3]))
+    except(ValueError):
+        return None
+
+def verify_password(password, password_hash):
+    ''' Checks a password against a stored hash. The comparison takes the
+        same time wherever the values differ.
+        
+        Args:
+            password (str): The plaintext password to check.
+            
+            password_hash (str): The stored hash. A plaintext password
+            stored before passwords were hashed is compared directly.
+        
+        Returns:
+            True -- The password matches.
+            False -- The password does not match. '''
+    
+    parsed = _parse_hash(password_hash)
+    
+    if parsed is None:
+        return hmac.compare_digest(password.encode('utf-8'),
+                                   password_hash.encode('utf-8'))
+    
+    iterations, salt, digest = parsed
+    
+    return hmac.compare_digest(_pbkdf2(password, salt, iterations), digest)
+
+def needs_rehash(password_hash, iterations=DEFAULT_ITERATIONS):
+    ''' Determines whether or not a stored password should be hashed again,
+        because it is plaintext or was hashed with other iterations.
+        
+        Args:
+            password_hash (str): The stored hash.
+            
+            iterations (int): The configured PBKDF2 iterations.
+        
+        Returns:
+            True -- The password should be hashed again.
+            False -- The hash is current. '''
+    
+    parsed = _parse_hash(password_hash)
+    
+    return parsed is None or parsed[0] != iterations
+
+def calibrate_iterations(target_seconds, sample_iterations=10000,
+                         samples=5):
+    ''' Picks the PBKDF2 iterations that take about the target time to
+        verify a password on this machine. Run it on the hardware that
+        serves the application.
+        
+        Args:
+            target_seconds (float): The target verification time.
+            
+            sample_iterations (int): The iterations hashed per sample.
+            
+            samples (int): The number of samples. The fastest is used,
+            since the slower ones were interrupted by other work.
+        
+        Returns:
+            (int): The iterations, rounded to a multiple of 1000. '''
+    
+    salt = os.urandom(SALT_SIZE)
+    fastest = None
+    
+    for sample in range(samples):
+        start = time.perf_counter()
+        _pbkdf2('calibration', salt, sample_iterations)
+        elapsed = time.perf_counter() - start
+        
+        if fastest is None or elapsed < fastest:
+            fastest = elapsed
+    
+    iterations = sample_iterations * target_seconds / fastest
+    
+    return max(1000, int(round(iterations / 1000)) * 1000)
+
+class VerifierBusyError(Exception):
+    ''' Raised when the password verifier already has as many hashes
+        running and waiting as it allows.'''
+    
+    def __str__(self):
+        '''Provides a string representation of the object.'''
+        
+        return 'VerifierBusyError: Too many passwords are being verified.'
+
+class PasswordVerifier:
+    ''' Hashes and verifies passwords on a bounded pool of threads, so a
+        burst of logins cannot occupy every worker. A hash runs on one of
+        :attr:`workers` threads while the request waits for it. At most
+        :attr:`queue_size` more hashes wait for a free thread; beyond that,
+        :class:`VerifierBusyError` is raised at once so the request can be
+        answered instead of queued. '''
+    
+    def __init__(self, workers=2, queue_size=16):
+        ''' Constructor
+        
+            Args:
+                workers (int): The number of threads that hash passwords.
+                
+                queue_size (int): The number of hashes that may wait for a
+                thread. '''
+        
+        #: (int): The number of threads that hash passwords.
+        self.workers = workers
+        
+        #: (int): The number of hashes that may wait for a thread.
+        self.queue_size = queue_size
+        
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        
+        # The threads are started by the first hash.
+        self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+    
+    def _run(self, function, *args):
+        ''' Runs a function on the pool and waits for its result.
+        
+            Raises:
+                VerifierBusyError: The pool and its queue are full.'''
+        
+        if not self._slots.acquire(False):
+            raise VerifierBusyError()
+        
+        try:
+            return self._executor.submit(function, *args).result()
+        finally:
+            self._slots.release()
+    
+    def verify(self, password, password_hash):
+        ''' Checks a password against a stored hash on the pool (see
+            :func:`verify_password`).
+            
+            Raises:
+                VerifierBusyError: The pool and its queue are full.'''
+        
+        return self._run(verify_password, password, password_hash)
+    
+    def hash(self, password, iterations=DEFAULT_ITERATIONS):
+        ''' Hashes a password on the pool (see :func:`hash_password`).
+        
+            Raises:
+                VerifierBusyError: The pool and its queue are full.'''
+        
+        return self._run(hash_password, password, iterations)
@@ -0,0 +1,15 @@
+/* File: 0001_unique_names.sql
+ * Description: Enforces unique project names and unique task names 
+ *              within a project. The task index also serves the 
+ *              task.project_id foreign key lookups.
+ * Date: 2026/10/18
+ */
+
+DROP INDEX CONCURRENTLY IF EXISTS project_name_key;
+
+CREATE UNIQUE INDEX CONCURRENTLY project_name_key ON project (name);
+
+DROP INDEX CONCURRENTLY IF EXISTS task_project_id_name_key;
+
+CREATE UNIQUE INDEX CONCURRENTLY task_project_id_name_key 
+  ON task (project_id, name);
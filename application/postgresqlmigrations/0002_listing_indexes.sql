@@ -0,0 +1,18 @@
+/* File: 0002_listing_indexes.sql
+ * Description: Adds the indexes used to list projects and tasks in 
+ *              (name, id) order and to find tasks by due date.
+ * Date: 2026/10/18
+ */
+
+DROP INDEX CONCURRENTLY IF EXISTS project_name_id_idx;
+
+CREATE INDEX CONCURRENTLY project_name_id_idx ON project (name, id);
+
+DROP INDEX CONCURRENTLY IF EXISTS task_project_id_name_id_idx;
+
+CREATE INDEX CONCURRENTLY task_project_id_name_id_idx 
+  ON task (project_id, name, id);
+
+DROP INDEX CONCURRENTLY IF EXISTS task_due_date_idx;
+
+CREATE INDEX CONCURRENTLY task_due_date_idx ON task (due_date);
@@ -0,0 +1,31 @@
+/* File: 0003_search_vectors.sql
+ * Description: Adds the full-text search vectors of projects and tasks. 
+ *              Triggers keep the vectors in sync with the name (weight 
+ *              A), brief description (weight B) and description (weight 
+ *              C) columns. The vectors of the existing rows are filled 
+ *              in batches by the migration runner before 0004 indexes 
+ *              them (see PostgreSQL._MIGRATION_BACKFILLS).
+ * Date: 2026/10/18
+ */
+
+ALTER TABLE project ADD COLUMN search_vector TSVECTOR;
+
+ALTER TABLE task ADD COLUMN search_vector TSVECTOR;
+
+CREATE FUNCTION search_vector_update() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.search_vector := 
+    setweight(to_tsvector('pg_catalog.english', NEW.name), 'A') || 
+    setweight(to_tsvector('pg_catalog.english', NEW.brief_description), 'B') || 
+    setweight(to_tsvector('pg_catalog.english', NEW.description), 'C');
+  RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER project_search_vector_update 
+  BEFORE INSERT OR UPDATE OF name, brief_description, description 
+  ON project FOR EACH ROW EXECUTE PROCEDURE search_vector_update();
+
+CREATE TRIGGER task_search_vector_update 
+  BEFORE INSERT OR UPDATE OF name, brief_description, description 
+  ON task FOR EACH ROW EXECUTE PROCEDURE search_vector_update();
@@ -0,0 +1,14 @@
+/* File: 0004_search_indexes.sql
+ * Description: Adds the GIN indexes used to search projects and tasks.
+ * Date: 2026/10/18
+ */
+
+DROP INDEX CONCURRENTLY IF EXISTS project_search_vector_idx;
+
+CREATE INDEX CONCURRENTLY project_search_vector_idx 
+  ON project USING GIN (search_vector);
+
+DROP INDEX CONCURRENTLY IF EXISTS task_search_vector_idx;
+
+CREATE INDEX CONCURRENTLY task_search_vector_idx 
+  ON task USING GIN (search_vector);
@@ -0,0 +1,130 @@
+/* File: 0005_project_stats.sql
+ * Description: Adds the project_stats rollup of the task counts by 
+ *              complexity and status and the earliest due date of the 
+ *              tasks that are not complete. Triggers keep the rollup 
+ *              current as projects and tasks are written.
+ * Date: 2026/10/18
+ */
+
+CREATE TABLE project_stats (
+  project_id INTEGER NOT NULL,
+  task_count INTEGER NOT NULL DEFAULT 0,
+  low_complexity_count INTEGER NOT NULL DEFAULT 0,
+  medium_complexity_count INTEGER NOT NULL DEFAULT 0,
+  high_complexity_count INTEGER NOT NULL DEFAULT 0,
+  not_started_count INTEGER NOT NULL DEFAULT 0,
+  in_progress_count INTEGER NOT NULL DEFAULT 0,
+  complete_count INTEGER NOT NULL DEFAULT 0,
+  earliest_open_due_date TIMESTAMP,
+  PRIMARY KEY (project_id),
+  CONSTRAINT fk_project_stats_project
+    FOREIGN KEY (project_id)
+    REFERENCES project (id)
+    ON DELETE CASCADE
+    ON UPDATE NO ACTION);
+
+CREATE FUNCTION project_stats_project_insert() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO project_stats (project_id) VALUES (NEW.id);
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION project_stats_task_change() RETURNS TRIGGER AS $$
+BEGIN
+  -- Lock the rollup rows first, so the statements below see the tasks 
+  -- committed by any transaction that held the lock before.
+  IF TG_OP <> 'INSERT' THEN
+    PERFORM 1 FROM project_stats WHERE project_id = OLD.project_id 
+      FOR UPDATE;
+  END IF;
+  
+  IF TG_OP <> 'DELETE' THEN
+    PERFORM 1 FROM project_stats WHERE project_id = NEW.project_id 
+      FOR UPDATE;
+  END IF;
+  
+  IF TG_OP <> 'INSERT' THEN
+    UPDATE project_stats SET 
+      task_count = task_count - 1,
+      low_complexity_count = 
+        low_complexity_count - (OLD.complexity = 'Low')::INTEGER,
+      medium_complexity_count = 
+        medium_complexity_count - (OLD.complexity = 'Medium')::INTEGER,
+      high_complexity_count = 
+        high_complexity_count - (OLD.complexity = 'High')::INTEGER,
+      not_started_count = 
+        not_started_count - (OLD.status = 'Not Started')::INTEGER,
+      in_progress_count = 
+        in_progress_count - (OLD.status = 'In-Progress')::INTEGER,
+      complete_count = complete_count - (OLD.status = 'Complete')::INTEGER,
+      -- Look the earliest open due date up again if the old task may have 
+      -- had it. The lookup already sees the new version of the task.
+      earliest_open_due_date = CASE 
+        WHEN OLD.status <> 'Complete' 
+          AND OLD.due_date <= earliest_open_due_date 
+        THEN (SELECT MIN(due_date) FROM task 
+              WHERE project_id = OLD.project_id AND status <> 'Complete') 
+        ELSE earliest_open_due_date END
+    WHERE project_id = OLD.project_id;
+  END IF;
+  
+  IF TG_OP <> 'DELETE' THEN
+    UPDATE project_stats SET 
+      task_count = task_count + 1,
+      low_complexity_count = 
+        low_complexity_count + (NEW.complexity = 'Low')::INTEGER,
+      medium_complexity_count = 
+        medium_complexity_count + (NEW.complexity = 'Medium')::INTEGER,
+      high_complexity_count = 
+        high_complexity_count + (NEW.complexity = 'High')::INTEGER,
+      not_started_count = 
+        not_started_count + (NEW.status = 'Not Started')::INTEGER,
+      in_progress_count = 
+        in_progress_count + (NEW.status = 'In-Progress')::INTEGER,
+      complete_count = complete_count + (NEW.status = 'Complete')::INTEGER,
+      earliest_open_due_date = CASE 
+        WHEN NEW.status <> 'Complete' 
+        THEN LEAST(earliest_open_due_date, NEW.due_date) 
+        ELSE earliest_open_due_date END
+    WHERE project_id = NEW.project_id;
+  END IF;
+  
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER project_stats_project_insert 
+  AFTER INSERT ON project 
+  FOR EACH ROW EXECUTE PROCEDURE project_stats_project_insert();
+
+CREATE TRIGGER project_stats_task_insert_delete 
+  AFTER INSERT OR DELETE ON task 
+  FOR EACH ROW EXECUTE PROCEDURE project_stats_task_change();
+
+-- Updates that only change the names or descriptions leave the rollup 
+-- alone.
+CREATE TRIGGER project_stats_task_update 
+  AFTER UPDATE ON task 
+  FOR EACH ROW 
+  WHEN ((OLD.project_id, OLD.complexity, OLD.due_date, OLD.status) 
+        IS DISTINCT FROM 
+        (NEW.project_id, NEW.complexity, NEW.due_date, NEW.status)) 
+  EXECUTE PROCEDURE project_stats_task_change();
+
+-- Build the rollups of the existing projects. The triggers already hold 
+-- locks that keep out writes until this migration commits.
+INSERT INTO project_stats (project_id, task_count, low_complexity_count, 
+                           medium_complexity_count, high_complexity_count, 
+                           not_started_count, in_progress_count, 
+                           complete_count, earliest_open_due_date) 
+SELECT p.id, COUNT(t.id), 
+  COUNT(CASE WHEN t.complexity = 'Low' THEN 1 END), 
+  COUNT(CASE WHEN t.complexity = 'Medium' THEN 1 END), 
+  COUNT(CASE WHEN t.complexity = 'High' THEN 1 END), 
+  COUNT(CASE WHEN t.status = 'Not Started' THEN 1 END), 
+  COUNT(CASE WHEN t.status = 'In-Progress' THEN 1 END), 
+  COUNT(CASE WHEN t.status = 'Complete' THEN 1 END), 
+  MIN(CASE WHEN t.status <> 'Complete' THEN t.due_date END) 
+FROM project p LEFT JOIN task t ON t.project_id = p.id 
+GROUP BY p.id;
@@ -0,0 +1,12 @@
+/* File: 0006_open_task_due_date_index.sql
+ * Description: Adds the partial index of the due dates of each 
+ *              project's open tasks, used to keep the earliest open due 
+ *              date of project_stats current and to count the past due 
+ *              tasks of a project.
+ * Date: 2026/10/18
+ */
+
+DROP INDEX CONCURRENTLY IF EXISTS task_project_id_open_due_date_idx;
+
+CREATE INDEX CONCURRENTLY task_project_id_open_due_date_idx 
+  ON task (project_id, due_date) WHERE status <> 'Complete';
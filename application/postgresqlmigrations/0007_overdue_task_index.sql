@@ -0,0 +1,10 @@
+/* File: 0007_overdue_task_index.sql
+ * Description: Adds the partial index of the open tasks of every 
+ *              project by due date, used to list the past due tasks.
+ * Date: 2026/10/18
+ */
+
+DROP INDEX CONCURRENTLY IF EXISTS task_open_due_date_id_idx;
+
+CREATE INDEX CONCURRENTLY task_open_due_date_id_idx 
+  ON task (due_date, id) WHERE status <> 'Complete';
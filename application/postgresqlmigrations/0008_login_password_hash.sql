@@ -0,0 +1,8 @@
+/* File: 0008_login_password_hash.sql
+ * Description: Widens the login password column to hold salted PBKDF2 
+ *              hashes. Passwords stored in plaintext before this 
+ *              migration are hashed the next time the user logs in.
+ * Date: 2026/10/18
+ */
+
+ALTER TABLE login ALTER COLUMN password TYPE VARCHAR(255);
\ No newline at end of file
@@ -0,0 +1,86 @@
+/* File: 0009_version_stamps.sql
+ * Description: Adds the version stamps used to answer conditional 
+ *              requests. Each project has a version and an updated_at 
+ *              time that change whenever the project or one of its tasks 
+ *              is written. The one row of project_list_version changes 
+ *              whenever a project is added, renamed or deleted. The 
+ *              statement-level triggers with transition tables need 
+ *              PostgreSQL 10 or later.
+ * Date: 2026/10/18
+ */
+
+ALTER TABLE project ADD COLUMN version BIGINT NOT NULL DEFAULT 1;
+
+ALTER TABLE project 
+  ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP;
+
+CREATE TABLE project_list_version (
+  version BIGINT NOT NULL,
+  updated_at TIMESTAMP NOT NULL);
+
+INSERT INTO project_list_version (version, updated_at) 
+  VALUES (1, LOCALTIMESTAMP);
+
+CREATE FUNCTION project_version_project_update() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.version := OLD.version + 1;
+  NEW.updated_at := LOCALTIMESTAMP;
+  RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+-- Bumps each project whose tasks a statement wrote once, however many of 
+-- its tasks the statement wrote, from the transition tables of the 
+-- statement.
+CREATE FUNCTION project_version_task_change() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    UPDATE project SET version = version + 1, updated_at = LOCALTIMESTAMP 
+    WHERE id IN (SELECT project_id FROM new_task);
+  ELSIF TG_OP = 'DELETE' THEN
+    UPDATE project SET version = version + 1, updated_at = LOCALTIMESTAMP 
+    WHERE id IN (SELECT project_id FROM old_task);
+  ELSE
+    UPDATE project SET version = version + 1, updated_at = LOCALTIMESTAMP 
+    WHERE id IN (SELECT project_id FROM old_task 
+                 UNION SELECT project_id FROM new_task);
+  END IF;
+  
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION project_list_version_change() RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE project_list_version 
+  SET version = version + 1, updated_at = LOCALTIMESTAMP;
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- The task trigger only sets the version columns, so it does not fire 
+-- this trigger.
+CREATE TRIGGER project_version_project_update 
+  BEFORE UPDATE OF name, brief_description, description ON project 
+  FOR EACH ROW EXECUTE PROCEDURE project_version_project_update();
+
+-- A trigger with transition tables fires for one event only, so each event 
+-- has its own trigger.
+CREATE TRIGGER project_version_task_insert 
+  AFTER INSERT ON task REFERENCING NEW TABLE AS new_task 
+  FOR EACH STATEMENT EXECUTE PROCEDURE project_version_task_change();
+
+CREATE TRIGGER project_version_task_update 
+  AFTER UPDATE ON task REFERENCING OLD TABLE AS old_task NEW TABLE AS new_task 
+  FOR EACH STATEMENT EXECUTE PROCEDURE project_version_task_change();
+
+CREATE TRIGGER project_version_task_delete 
+  AFTER DELETE ON task REFERENCING OLD TABLE AS old_task 
+  FOR EACH STATEMENT EXECUTE PROCEDURE project_version_task_change();
+
+-- Fires once per statement, so a bulk insert bumps the list version once. 
+-- Project writes wait on each other for the row of project_list_version, 
+-- which is fine since they are rare next to task writes.
+CREATE TRIGGER project_list_version_change 
+  AFTER INSERT OR DELETE OR UPDATE OF name, brief_description ON project 
+  FOR EACH STATEMENT EXECUTE PROCEDURE project_list_version_change();
\ No newline at end of file
@@ -1,6 +1,8 @@
 /* File: postgresqlschema.sql
  * Description: Queries used to create the Project Management application 
- *              database schema for a PostgreSQL database.
+ *              database schema for a PostgreSQL database. Indexes and 
+ *              later changes to the schema are applied by the 
+ *              migrations in the postgresqlmigrations folder.
  * Date: 2014/04/27
  * Programmer: Thomas Newman
  */
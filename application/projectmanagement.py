@@ -10,9 +10,17 @@
 from datetime import datetime
 from flask import *
 from .model import *
+from . import assets
+from . import bytecodecache
 from . import database
+from . import fragments
+from . import passwords
+import collections
+import hashlib
 import jinja2
+import mimetypes
 import os
+import time
 
 # Set the Flask application that will be served to this application
 app = Flask(__name__)
@@ -25,10 +33,205 @@ app.secret_key = os.environ.get('SECRET_KEY')
 # environmental variables.
 app.config['DATABASE_URL'] = os.environ.get('DATABASE_URL')
 
+# Set the database connection pool settings to the settings stored in the 
+# environmental variables. The pool is shared by the requests handled by 
+# each worker process.
+app.config['DATABASE_POOL_MIN_SIZE'] = int(
+    os.environ.get('DATABASE_POOL_MIN_SIZE', 1))
+app.config['DATABASE_POOL_MAX_SIZE'] = int(
+    os.environ.get('DATABASE_POOL_MAX_SIZE', 10))
+app.config['DATABASE_POOL_TIMEOUT'] = float(
+    os.environ.get('DATABASE_POOL_TIMEOUT', 30))
+app.config['DATABASE_POOL_MAX_IDLE_TIME'] = float(
+    os.environ.get('DATABASE_POOL_MAX_IDLE_TIME', 300))
+
+# Set the read replica URLs to the whitespace separated URLs stored in the 
+# environmental variables. Reads are spread over the replicas, except for 
+# the reads of a session that wrote within the last 
+# DATABASE_PRIMARY_STICKINESS seconds, which go to the primary database.
+app.config['DATABASE_REPLICA_URLS'] = os.environ.get(
+    'DATABASE_REPLICA_URLS', '').split()
+app.config['DATABASE_PRIMARY_STICKINESS'] = float(
+    os.environ.get('DATABASE_PRIMARY_STICKINESS', 5))
+
+# Set the number of projects or tasks listed per page to the page size 
+# stored in the environmental variables.
+app.config['PAGE_SIZE'] = int(os.environ.get('PAGE_SIZE', 50))
+
+# Set the entity cache settings to the settings stored in the 
+# environmental variables. A cache size of 0 disables the cache. Each 
+# worker process has its own cache.
+app.config['CACHE_SIZE'] = int(os.environ.get('CACHE_SIZE', 1000))
+app.config['CACHE_TIME_TO_LIVE'] = float(
+    os.environ.get('CACHE_TIME_TO_LIVE', 30))
+
+# Set the fragment cache settings to the settings stored in the 
+# environmental variables. Each worker process keeps up to 
+# FRAGMENT_CACHE_SIZE bytes of rendered fragments; a size of 0 disables the 
+# cache. If memcached servers are listed in FRAGMENT_CACHE_SERVERS, the 
+# worker processes share the fragments there instead.
+app.config['FRAGMENT_CACHE_SIZE'] = int(
+    os.environ.get('FRAGMENT_CACHE_SIZE', 8388608))
+app.config['FRAGMENT_CACHE_TIME_TO_LIVE'] = float(
+    os.environ.get('FRAGMENT_CACHE_TIME_TO_LIVE', 300))
+app.config['FRAGMENT_CACHE_SERVERS'] = os.environ.get(
+    'FRAGMENT_CACHE_SERVERS', '').split()
+
+# Set the directory the compiled templates are stored in to the directory 
+# stored in the environmental variables. The worker processes share the 
+# compiled templates; an empty directory name disables the bytecode cache.
+app.config['TEMPLATE_CACHE_DIR'] = os.environ.get(
+    'TEMPLATE_CACHE_DIR', os.path.join(app.root_path, 'templatecache'))
+
+# Set the password hashing settings to the settings stored in the 
+# environmental variables. Passwords are hashed and verified on a pool of 
+# PASSWORD_VERIFY_WORKERS threads per worker process. At most 
+# PASSWORD_VERIFY_QUEUE_SIZE more logins wait for a thread; further logins 
+# are turned away until the burst passes.
+app.config['PASSWORD_HASH_ITERATIONS'] = int(
+    os.environ.get('PASSWORD_HASH_ITERATIONS', passwords.DEFAULT_ITERATIONS))
+app.config['PASSWORD_VERIFY_WORKERS'] = int(
+    os.environ.get('PASSWORD_VERIFY_WORKERS', 2))
+app.config['PASSWORD_VERIFY_QUEUE_SIZE'] = int(
+    os.environ.get('PASSWORD_VERIFY_QUEUE_SIZE', 16))
+
+# The password verifier shared by the requests of this process.
+password_verifier = passwords.PasswordVerifier(
+    app.config['PASSWORD_VERIFY_WORKERS'], 
+    app.config['PASSWORD_VERIFY_QUEUE_SIZE'])
+
+# The entity cache shared by the requests of this process.
+entity_cache = None
+
+if app.config['CACHE_SIZE'] > 0:
+    entity_cache = database.EntityCache(app.config['CACHE_SIZE'], 
+                                        app.config['CACHE_TIME_TO_LIVE'])
+
 # Set the debug mode for the application to the debug mode stored in the 
 # environmental variables.
 app.debug = bool(os.environ.get('DEBUG'))
 
+def _bytecode_cache():
+    ''' Creates the bytecode cache the compiled templates are stored in.
+    
+        Returns:
+            (:class:`bytecodecache.SharedBytecodeCache`): The bytecode 
+            cache.
+            
+            None if the cache is disabled or its directory cannot be 
+            created. '''
+    
+    directory = app.config['TEMPLATE_CACHE_DIR']
+    
+    if not directory:
+        return None
+    
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except(EnvironmentError):
+        return None
+    
+    return bytecodecache.SharedBytecodeCache(directory)
+
+# Load the templates through the bytecode cache. Outside of debug mode, the 
+# loaded templates are not checked for changes on every render.
+app.jinja_env.bytecode_cache = _bytecode_cache()
+app.jinja_env.auto_reload = app.debug
+
+# The folder the static assets are built in (see :func:`build_assets`).
+asset_folder = os.path.join(app.static_folder, 'build')
+
+# The built name of each static asset, by source name. It is empty until the 
+# assets are built.
+asset_manifest = assets.load_manifest(asset_folder)
+
+def _template_version():
+    ''' Digests the templates and the names of the built assets they link 
+        to, so that the ETags of the pages change when a deployment changes 
+        how they are rendered.
+        
+        Returns:
+            (str): The first 12 hexadecimal digits of the digest. '''
+    
+    digest = hashlib.sha1()
+    template_path = os.path.join(app.root_path, app.template_folder)
+    
+    for directory, directories, files in sorted(os.walk(template_path)):
+        for file_name in sorted(files):
+            with open(os.path.join(directory, file_name), 'rb') as file:
+                digest.update(file.read())
+    
+    for name in sorted(asset_manifest):
+        digest.update((name + '=' + asset_manifest[name]).encode('utf-8'))
+    
+    return digest.hexdigest()[:12]
+
+# The version of the templates, which is part of every ETag.
+template_version = _template_version()
+
+# The cache of rendered fragments shared by the requests of this process, 
+# or by every process if memcached servers are configured.
+fragment_cache = None
+
+if app.config['FRAGMENT_CACHE_SERVERS']:
+    # python-memcached is only needed for a shared fragment cache.
+    import memcache
+    
+    fragment_cache = fragments.FragmentCache(
+        fragments.MemcachedFragmentBackend(
+            memcache.Client(app.config['FRAGMENT_CACHE_SERVERS'])), 
+        app.config['FRAGMENT_CACHE_TIME_TO_LIVE'], template_version)
+elif app.config['FRAGMENT_CACHE_SIZE'] > 0:
+    fragment_cache = fragments.FragmentCache(
+        fragments.MemoryFragmentBackend(app.config['FRAGMENT_CACHE_SIZE']), 
+        app.config['FRAGMENT_CACHE_TIME_TO_LIVE'], template_version)
+
+@app.template_global()
+def cached_fragment(key, expires_at=None, caller=None):
+    ''' Renders the body of a call block through the fragment cache:
+        
+            {% call cached_fragment(key, expires_at) %}...{% endcall %}
+        
+        Args:
+            key (tuple): The key of the fragment (see 
+            :meth:`fragments.FragmentCache.get_or_render`).
+            
+            expires_at (datetime): When the fragment goes out of date 
+            without a write. None if only a write changes it.
+            
+            caller (callable): Renders the body of the call block.
+        
+        Returns:
+            (Markup): The rendered fragment. '''
+    
+    if fragment_cache is None:
+        return caller()
+    
+    return Markup(fragment_cache.get_or_render(key, caller, expires_at))
+
+@app.template_global()
+def asset_url(filename):
+    ''' Provides the URL of a static asset. Once the assets are built, this 
+        is the URL of the built asset, which browsers cache for a year.
+        
+        Args:
+            filename (str): The name of the asset in the static folder.
+        
+        Returns:
+            (str): The URL of the asset. '''
+    
+    built_name = asset_manifest.get(filename)
+    
+    if built_name is None:
+        return url_for('static', filename=filename)
+    
+    return url_for('asset', filename=built_name)
+
+# Outside of debug mode, load the templates when the worker process starts, 
+# so its first requests do not wait for them.
+if not app.debug:
+    bytecodecache.compile_templates(app.jinja_env)
+
 @app.route('/')
 def index():
     ''' Handles the get request for the index.
@@ -44,6 +247,31 @@ def index():
     
     return redirect(url_for('projects'))
 
+@app.route('/assets/<filename>', methods=['GET'])
+def asset(filename):
+    ''' Handles the get request for a built static asset.
+    
+        Returns:
+            The compressed copy of the asset the browser accepts, without 
+            compressing it again, or else the asset itself. The name of a 
+            built asset changes with its content, so it may be cached for 
+            a year without being checked. '''
+    
+    name, encoding = assets.choose_encoding(asset_folder, filename, 
+                                            request.accept_encodings)
+    
+    response = send_from_directory(asset_folder, name, 
+                                   mimetype=mimetypes.guess_type(filename)[0], 
+                                   cache_timeout=assets.MAX_AGE)
+    response.headers['Cache-Control'] = ('public, max-age=%d, immutable' % 
+                                         assets.MAX_AGE)
+    response.vary.add('Accept-Encoding')
+    
+    if encoding is not None:
+        response.content_encoding = encoding
+    
+    return response
+
 @app.route('/login', methods=['GET'])
 def login_get():
     ''' Handles the get request to login in.
@@ -92,12 +320,26 @@ def login_post():
         
         # A record was found for the username in the database
         if login != None:
-            # The username and password are correct
-            if login.check_login(username, password):
-                session['user_id'] = login.id
-                return redirect(url_for('projects'))
-            else:
-                request.errors.append('password_incorrect')
+            iterations = app.config['PASSWORD_HASH_ITERATIONS']
+            
+            try:
+                # The username and password are correct
+                if login.check_login(username, password, 
+                                     password_verifier.verify):
+                    # Hash plaintext passwords and passwords hashed with 
+                    # other iterations again while the password is known.
+                    if login.needs_rehash(iterations):
+                        login.password = password_verifier.hash(password, 
+                                                                iterations)
+                        db.update_login(login)
+                    
+                    session['user_id'] = login.id
+                    return redirect(url_for('projects'))
+                else:
+                    request.errors.append('password_incorrect')
+            except(passwords.VerifierBusyError):
+                request.errors.append('login_busy')
+                return render_template('login.html'), 503, {'Retry-After': '1'}
         else:
             request.errors.append('username_not_exist')
     
@@ -128,9 +370,115 @@ def projects():
     
     db = get_database()
     
-    request.projects = db.load_projects()
+    # Answer from the version of the project list if the browser's copy 
+    # is current.
+    stamp = db.load_project_list_version()
+    response = _not_modified(stamp)
+    
+    if response is not None:
+        return response
+    
+    page_arguments = _get_page_arguments()
+    
+    request.projects_page = db.load_projects_page(**page_arguments)
+    request.projects = request.projects_page.items
+    
+    # The rendered list is cached for the version of the project list.
+    request.projects_fragment_key = (('projects', stamp.version) + 
+                                     tuple(sorted(page_arguments.items())))
+    
+    response = make_response(render_template('viewprojects.html'))
+    
+    return _add_validators(response, stamp)
+
+@app.route('/search', methods=['GET'])
+def search():
+    ''' Handles the get request to search the projects and tasks.
+        
+        Query String:
+            q (str) - The words to search for.
+            page (int) - The page of results to display, starting at 1.
+        
+        Returns:
+            Displays the search form and a page of the results. '''
+    
+    # If the user is not logged in, redirect to the login form
+    if not 'user_id' in session:
+        return redirect(url_for('logout'))
+    
+    request.query = request.args.get('q', '').strip()
+    request.page_number = max(request.args.get('page', 1, type=int), 1)
+    request.results_page = None
+    
+    if request.query:
+        db = get_database()
+        page_size = app.config['PAGE_SIZE']
+        request.results_page = db.search(
+            request.query, page_size, (request.page_number - 1) * page_size)
+    
+    return render_template('search.html')
+
+@app.route('/overdue', methods=['GET'])
+def overdue():
+    ''' Handles the get request to display the past due tasks of every 
+        project.
+        
+        Query String:
+            after_due_date (str) - The due date of the last task on the 
+                                   previous page.
+            after_id (int) - The id of the last task on the previous page.
+            before_due_date (str) - The due date of the first task on the 
+                                    next page.
+            before_id (int) - The id of the first task on the next page.
+        
+        Returns:
+            Displays a page of the past due tasks ordered by due date and 
+            grouped by project. '''
+    
+    # If the user is not logged in, redirect to the login form
+    if not 'user_id' in session:
+        return redirect(url_for('logout'))
+    
+    db = get_database()
+    
+    request.tasks_page = db.load_overdue_tasks(
+        limit=app.config['PAGE_SIZE'],
+        after_due_date=request.args.get('after_due_date', 
+                                        type=_parse_timestamp),
+        after_id=request.args.get('after_id', 0, type=int),
+        before_due_date=request.args.get('before_due_date', 
+                                         type=_parse_timestamp),
+        before_id=request.args.get('before_id', 0, type=int))
+    
+    # Group the tasks by project. The projects are listed in the order of 
+    # their most overdue task on the page.
+    request.overdue_projects = collections.OrderedDict()
+    
+    for project, task in request.tasks_page.items:
+        if project.id not in request.overdue_projects:
+            request.overdue_projects[project.id] = (project, [])
+        
+        request.overdue_projects[project.id][1].append(task)
     
-    return render_template('viewprojects.html')
+    return render_template('overdue.html')
+
+def _parse_timestamp(value):
+    ''' Parses a timestamp from a query string.
+        
+        Args:
+            value (str): The timestamp in ISO 8601 format, with or without 
+                         microseconds.
+        
+        Returns:
+            (datetime): The timestamp.
+        
+        Raises:
+            ValueError: The value is not a timestamp. '''
+    
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f')
+    except(ValueError):
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S')
 
 @app.route('/projects/addproject', methods=['GET', 'POST'])
 def add_project():
@@ -155,13 +503,20 @@ def add_project():
     request.project = Project()
     
     if request.method == 'POST':
-        request.errors = _validate_project_post(request.project)
-        
         db = get_database()
         
-        if not request.errors:
-            db.insert_project(request.project)
-            return redirect(url_for('projects'))
+        try:
+            # Validate and add the project as one unit of work
+            with db.transaction():
+                request.errors = _validate_project_post(request.project)
+                
+                if not request.errors:
+                    db.insert_project(request.project)
+                    return redirect(url_for('projects'))
+        except(database.DuplicateNameError):
+            # Another project with the name was added after the 
+            # validation.
+            request.errors.append('name_duplicate')
     
     return render_template('addproject.html')
 
@@ -183,51 +538,107 @@ def project(project_id):
     
     db = get_database()
     
-    request.project = db.load_project(project_id)
-    request.tasks = db.load_tasks(project_id)
-    
-    # Complexity
-    request.low_complexity_count = 0
-    request.medium_complexity_count = 0
-    request.high_complexity_count = 0
-    
-    # Status
-    request.not_started_count = 0
-    request.in_progress_count = 0
-    request.complete_count = 0
-    
-    # Past Due
-    request.on_time_count = 0
-    request.past_due_count = 0
-    
-    # Track status for complexity, status, and past due
-    for task in request.tasks:
-        # Complexity Statistics
-        if task.complexity == Complexity.LOW:
-            request.low_complexity_count = request.low_complexity_count + 1
-        elif task.complexity == Complexity.MEDIUM:
-            request.medium_complexity_count = request.medium_complexity_count + 1
-        elif task.complexity == Complexity.HIGH:
-            request.high_complexity_count = request.high_complexity_count + 1
-        
-        # Status Statistics
-        if task.status == Status.NOT_STARTED:
-            request.not_started_count = request.not_started_count + 1
-        elif task.status == Status.IN_PROGRESS:
-            request.in_progress_count = request.in_progress_count + 1
-        elif task.status == Status.COMPLETE:
-            request.complete_count = request.complete_count + 1
-        
-        # Past Due Statistics
-        if task.is_task_past_due():
-            request.past_due_count = request.past_due_count + 1
-        else:
-            request.on_time_count = request.on_time_count + 1
+    # Answer from the version of the project if the browser's copy is 
+    # current.
+    stamp = db.load_project_version(project_id)
+    response = _not_modified(stamp)
+    
+    if response is not None:
+        return response
+    
+    # The project, its chart data (counted by the database rather than 
+    # from the task list) and the page of tasks are loaded together.
+    page_arguments = _get_page_arguments()
+    request.project, request.statistics, request.tasks_page = \
+        db.load_project_with_tasks(project_id, **page_arguments)
     
     if not request.project:
         abort(404)
     
-    return render_template('viewproject.html')
+    request.tasks = request.tasks_page.items
+    
+    # The rendered task table is cached for the version of the project 
+    # until the next task in it becomes past due.
+    now = datetime.now()
+    request.tasks_fragment_key = (('project', project_id, stamp.version) + 
+                                  tuple(sorted(page_arguments.items())))
+    request.tasks_fragment_expires_at = min(
+        (task.due_date for task in request.tasks 
+         if task.status != Status.COMPLETE and task.due_date >= now), 
+        default=None)
+    
+    response = make_response(render_template('viewproject.html'))
+    
+    return _add_validators(response, stamp)
+
+def _not_modified(stamp):
+    ''' Answers a conditional GET request without loading or rendering 
+        the page if the browser's copy of the page is current, according 
+        to its If-None-Match or If-Modified-Since header.
+        
+        Args:
+            stamp (:class:`VersionStamp`): The version of the page's data. 
+            None if the data does not exist.
+        
+        Returns:
+            A 304 Not Modified response if the browser's copy is current.
+            
+            None if the page has to be loaded and rendered. '''
+    
+    if stamp is None:
+        return None
+    
+    response = _add_validators(app.response_class(), stamp)
+    response.make_conditional(request)
+    
+    if response.status_code == 304:
+        return response
+    
+    return None
+
+def _add_validators(response, stamp):
+    ''' Adds the ETag and Last-Modified headers of a page to its response. 
+        The browser has to revalidate its copy on every visit, and shared 
+        caches may not store the page.
+        
+        Args:
+            response (:class:`flask.Response`): The response.
+            
+            stamp (:class:`VersionStamp`): The version of the page's data.
+        
+        Returns:
+            The response. '''
+    
+    response.set_etag(template_version + '-' + stamp.etag)
+    response.last_modified = stamp.last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    
+    return response
+
+def _get_page_arguments():
+    ''' Parses the page location from the query string of a paginated 
+        list.
+        
+        Query String:
+            after_name (str) - The name of the last item on the previous 
+                               page.
+            after_id (int) - The id of the last item on the previous page.
+            before_name (str) - The name of the first item on the next 
+                                page.
+            before_id (int) - The id of the first item on the next page.
+            
+        Returns:
+            ({str: object}): The keyword arguments for the Database page 
+                             loading methods. '''
+    
+    return {
+        'after_name': request.args.get('after_name'),
+        'after_id': request.args.get('after_id', 0, type=int),
+        'before_name': request.args.get('before_name'),
+        'before_id': request.args.get('before_id', 0, type=int),
+        'limit': app.config['PAGE_SIZE']
+        }
 
 @app.route('/project/<int:project_id>/modifyproject', methods=['GET', 'POST'])
 def modify_project(project_id):
@@ -264,11 +675,19 @@ def modify_project(project_id):
         abort(404)
     
     if request.method == 'POST':
-        request.errors = _validate_project_post(request.project)
-        
-        if not request.errors:
-            db.update_project(request.project)
-            return redirect(url_for('project', project_id=project_id))
+        try:
+            # Validate and modify the project as one unit of work
+            with db.transaction():
+                request.errors = _validate_project_post(request.project)
+                
+                if not request.errors:
+                    # The project may have been deleted since it was loaded
+                    if not db.update_project(request.project):
+                        abort(404)
+                    
+                    return redirect(url_for('project', project_id=project_id))
+        except(database.DuplicateNameError):
+            request.errors.append('name_duplicate')
     
     return render_template('modifyproject.html')
 
@@ -291,14 +710,10 @@ def delete_project(project_id):
     
     db = get_database()
     
-    project = db.load_project(project_id)
-    
-    # Cannot delete a task for a project that does not exist
-    if not project:
+    # Cannot delete a project that does not exist
+    if not db.delete_project(project_id):
         abort(404)
     
-    db.delete_project(project_id)
-    
     return redirect(url_for('projects'))
 
 def _validate_project_post(project):
@@ -345,17 +760,12 @@ def _validate_project_post(project):
         except(ValueError):
             errors.append('description_invalid')
     
-    # Make sure the name is not a duplicate
+    # Make sure the name is not a duplicate. The name can obviously be the 
+    # same if the same project is being updated.
     db = get_database()
-    projects = db.load_projects()
     
-    for current_project in projects:
-        if current_project.name == project.name:
-            # The name can obviously be the same if the same task is 
-            # being updated
-            if current_project.id != project.id:
-                errors.append('name_duplicate')
-                break
+    if 'name_blank' not in errors and db.name_exists(project):
+        errors.append('name_duplicate')
     
     return errors
 
@@ -380,13 +790,23 @@ def task(project_id, task_id):
     
     db = get_database()
     
-    request.project = db.load_project(project_id)
-    request.task = db.load_task(project_id, task_id)
+    # A task is part of its project's version, so answer from the version 
+    # of the project if the browser's copy is current.
+    stamp = db.load_project_version(project_id)
+    response = _not_modified(stamp)
+    
+    if response is not None:
+        return response
+    
+    request.project, request.task = db.load_task_with_project(project_id, 
+                                                              task_id)
     
     if not request.project or not request.task:
         abort(404)
     
-    return render_template('viewtask.html')
+    response = make_response(render_template('viewtask.html'))
+    
+    return _add_validators(response, stamp)
 
 @app.route('/project/<int:project_id>/addtask', methods=['GET', 'POST'])
 def add_task(project_id):
@@ -423,18 +843,25 @@ def add_task(project_id):
     request.project = db.load_project(project_id)
     
     # Cannot add a task for a project that does not exist
-    if not project:
+    if not request.project:
         abort(404)
     
     request.task = Task()
     request.task.project_id = project_id
     
     if request.method == 'POST':
-        request.errors = _validate_task_post(request.task)
-        
-        if not request.errors:
-            db.insert_task(request.task)
-            return redirect(url_for('project', project_id=project_id))
+        try:
+            # Validate and add the task as one unit of work
+            with db.transaction():
+                request.errors = _validate_task_post(request.task)
+                
+                if not request.errors:
+                    db.insert_task(request.task)
+                    return redirect(url_for('project', project_id=project_id))
+        except(database.DuplicateNameError):
+            # Another task with the name was added to the project after 
+            # the validation.
+            request.errors.append('name_duplicate')
     
     return render_template('addtask.html')
 
@@ -472,25 +899,29 @@ def modify_task(project_id, task_id):
     
     db = get_database()
     
-    request.project = db.load_project(project_id)
-    
-    # Cannot add a task for a project that does not exist
-    if not project:
-        abort(404)
-    
-    request.task = db.load_task(project_id, task_id)
+    request.project, request.task = db.load_task_with_project(project_id, 
+                                                              task_id)
     
-    # Cannot modify a task that does not exist
-    if not request.task:
+    # Cannot modify a task that does not exist or a task for a project 
+    # that does not exist
+    if not request.project or not request.task:
         abort(404)
     
     if request.method == 'POST':
-        request.errors = _validate_task_post(request.task)
-        
-        if not request.errors:
-            db.update_task(request.task)
-            return redirect(url_for('task', project_id=project_id, 
-                                task_id=task_id))
+        try:
+            # Validate and modify the task as one unit of work
+            with db.transaction():
+                request.errors = _validate_task_post(request.task)
+                
+                if not request.errors:
+                    # The task may have been deleted since it was loaded
+                    if not db.update_task(request.task):
+                        abort(404)
+                    
+                    return redirect(url_for('task', project_id=project_id, 
+                                        task_id=task_id))
+        except(database.DuplicateNameError):
+            request.errors.append('name_duplicate')
     
     return render_template('modifytask.html')
 
@@ -517,20 +948,11 @@ def delete_task(project_id, task_id):
     
     db = get_database()
     
-    project = db.load_project(project_id)
-    
-    # Cannot delete a task for a project that does not exist
-    if not project:
+    # Cannot delete a task that does not exist or a task for a project 
+    # that does not exist
+    if not db.delete_task(project_id, task_id):
         abort(404)
     
-    request.task = db.load_task(project_id, task_id)
-    
-    # Cannot delete a project that does not exist
-    if not request.task:
-        abort(404)
-    
-    db.delete_task(project_id, task_id)
-    
     return redirect(url_for('project', project_id=project_id))
 
 def _validate_task_post(task):
@@ -613,20 +1035,43 @@ def _validate_task_post(task):
         except(ValueError):
             errors.append('status_invalid')
     
-    # Make sure the name is not a duplicate
+    # Make sure the name is not a duplicate. The name can obviously be the 
+    # same if the same task is being updated.
     db = get_database()
-    tasks = db.load_tasks(task.project_id)
     
-    for current_task in tasks:
-        if current_task.name == task.name:
-            # The name can obviously be the same if the same task is 
-            # being updated
-            if current_task.id != task.id:
-                errors.append('name_duplicate')
-                break
+    if 'name_blank' not in errors and db.name_exists(task):
+        errors.append('name_duplicate')
     
     return errors
 
+@app.route('/status/database', methods=['GET'])
+def database_status():
+    ''' Handles the get request to display the database connection pool 
+        and entity cache metrics of the worker process that serves the 
+        request.
+        
+        Returns:
+            The pool size, utilization and wait times and the cache hits 
+            and misses as JSON. '''
+    
+    # If the user is not logged in, redirect to the login form
+    if not 'user_id' in session:
+        return redirect(url_for('logout'))
+    
+    db = get_database()
+    
+    cache_statistics = {}
+    fragment_statistics = {}
+    
+    if entity_cache is not None:
+        cache_statistics = entity_cache.statistics()
+    
+    if fragment_cache is not None:
+        fragment_statistics = fragment_cache.statistics()
+    
+    return jsonify(pool=db.pool_statistics(), cache=cache_statistics, 
+                   fragments=fragment_statistics)
+
 @app.errorhandler(404)
 def not_found(error):
     ''' Renders the page for 404 Not Found and sets the status code to 
@@ -650,21 +1095,54 @@ def internal_server_error(error):
 
 def get_database():
     ''' Returns the request's database object. The database object is 
-        created if it does not exist yet. '''
+        created if it does not exist yet and borrows a connection from 
+        the worker's connection pool. Loads go through the worker's 
+        entity cache if it is enabled. Reads go to the primary database 
+        if the session wrote recently (see :func:`stick_to_primary`). '''
     
     if not hasattr(g, 'database'):
         database_url = app.config['DATABASE_URL']
-        g.database = database.get_database_from_url(database_url)
+        db = database.get_database_from_url(
+            database_url,
+            app.config['DATABASE_REPLICA_URLS'],
+            min_size=app.config['DATABASE_POOL_MIN_SIZE'],
+            max_size=app.config['DATABASE_POOL_MAX_SIZE'],
+            timeout=app.config['DATABASE_POOL_TIMEOUT'],
+            max_idle_time=app.config['DATABASE_POOL_MAX_IDLE_TIME'])
+        
+        # Answer repeated project, task and login loads from the cache, 
+        # and drop the rendered fragments of what the request writes.
+        if entity_cache is not None:
+            db = database.CachingDatabase(db, entity_cache, fragment_cache)
+        
+        if has_request_context():
+            db.read_from_primary = (session.get('primary_until', 0) > 
+                                    time.time())
+        
+        g.database = db
         g.database.open()
     
     return g.database
 
+@app.after_request
+def stick_to_primary(response):
+    ''' Sends the session's reads to the primary database for a short 
+        while after the request writes, so the page the session is 
+        redirected to shows the write even if the replicas lag behind. '''
+    
+    if (app.config['DATABASE_REPLICA_URLS'] and hasattr(g, 'database') and 
+            g.database.has_written()):
+        session['primary_until'] = (time.time() + 
+                                    app.config['DATABASE_PRIMARY_STICKINESS'])
+    
+    return response
+
 @app.teardown_appcontext
 def close_database(error):
-    ''' Closes the request's database object at the end of the request 
-        if one was created. '''
+    ''' Returns the request's database connection to the connection pool 
+        at the end of the request if one was borrowed. '''
     
-    if hasattr(g, 'db'):
+    if hasattr(g, 'database'):
         g.database.close()
 
 def initialize_database(username, password):
@@ -674,8 +1152,71 @@ def initialize_database(username, password):
         Args:
             username (str): The username of the user to create.
             
-            password (str): The password of the user to create. '''
+            password (str): The password of the user to create.
+        
+        Returns:
+            ([str]): The names of the migrations that were applied. '''
+    
+    with app.app_context():
+        db = get_database()
+        return db.initialize_database(
+            username, password, app.config['PASSWORD_HASH_ITERATIONS'])
+
+def build_assets():
+    ''' Minifies the static style sheets and scripts and writes them under 
+        names that include a digest of their content, with compressed 
+        copies (see :func:`assets.build_assets`). The worker processes 
+        started afterwards link to the built assets.
+        
+        Returns:
+            A dict of the built name of each asset, by source name. '''
+    
+    return assets.build_assets(app.static_folder, asset_folder)
+
+def warm_templates():
+    ''' Compiles the templates into the bytecode cache, so the worker 
+        processes started afterwards load them instead of compiling them.
+        
+        Returns:
+            ([str]): The names of the templates.
+            
+            None if the bytecode cache is disabled. '''
+    
+    if app.jinja_env.bytecode_cache is None:
+        return None
+    
+    return bytecodecache.compile_templates(app.jinja_env)
+
+def migrate_database():
+    ''' Applies the database schema migrations that have not been applied 
+        yet.
+        
+        Returns:
+            ([str]): The names of the migrations that were applied. '''
+    
+    with app.app_context():
+        db = get_database()
+        return db.migrate()
+
+def rebuild_project_statistics():
+    ''' Recomputes the stored task statistics of every project, for use 
+        after bulk loads.
+        
+        Returns:
+            (int): The number of projects whose statistics were rebuilt. '''
+    
+    with app.app_context():
+        db = get_database()
+        return db.rebuild_project_statistics()
+
+def verify_project_statistics():
+    ''' Compares the stored task statistics of every project with 
+        statistics computed from its tasks.
+        
+        Returns:
+            ([int]): The ids of the projects whose stored statistics 
+                     differ. '''
     
     with app.app_context():
         db = get_database()
-        db.initialize_database(username, password)
\ No newline at end of file
+        return db.verify_project_statistics()
\ No newline at end of file
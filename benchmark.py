@@ -0,0 +1,397 @@
+# File: benchmark.py
+# Description: Measures the performance of the Project Management
+#              Application against the configured database.
+# Date: 2026/10/18
+
+''' Measures the performance of the Project Management Application against
+    the configured database. The benchmarks create their own projects and
+    delete them when they finish. '''
+
+from datetime import datetime, timedelta
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+def create_tasks(project_id, count):
+    ''' Generates tasks for a benchmark.
+    
+        Args:
+            project_id (int): The id of the project the tasks belong to.
+            
+            count (int): The number of tasks to generate.
+        
+        Returns:
+            A list of :class:`application.model.Task` objects. '''
+    
+    from application.model import Complexity, Status, Task
+    
+    complexities = [Complexity.LOW, Complexity.MEDIUM, Complexity.HIGH]
+    statuses = [Status.NOT_STARTED, Status.IN_PROGRESS, Status.COMPLETE]
+    start = datetime(2014, 1, 1)
+    tasks = []
+    
+    for number in range(count):
+        task = Task()
+        task.project_id = project_id
+        task.name = 'Task %d' % number
+        task.brief_description = 'Benchmark task %d' % number
+        task.description = 'Generated by benchmark.py. ' * 20
+        task.complexity = complexities[number % 3]
+        task.due_date = start + timedelta(days=number % 365)
+        task.status = statuses[number % 3]
+        
+        tasks.append(task)
+    
+    return tasks
+
+def create_project(db):
+    ''' Creates a uniquely named project for a benchmark.
+    
+        Args:
+            db (:class:`application.database.Database`): The database.
+        
+        Returns:
+            The :class:`application.model.Project` that was created. '''
+    
+    from application.model import Project
+    
+    project = Project()
+    project.name = 'Benchmark %f' % time.time()
+    project.brief_description = 'Benchmark project'
+    project.description = 'Generated by benchmark.py.'
+    
+    db.insert_project(project)
+    
+    for current_project in db.load_projects():
+        if current_project.name == project.name:
+            return current_project
+
+def report(name, rows, seconds):
+    ''' Prints the throughput of a benchmark. '''
+    
+    print('%-30s %8d rows %10.3f s %12.0f rows/s' %
+          (name, rows, seconds, rows / seconds))
+
+def report_latency(name, calls, seconds):
+    ''' Prints the average latency of a benchmark. '''
+    
+    print('%-30s %8d calls %10.3f s %10.1f us/call' %
+          (name, calls, seconds, seconds / calls * 1000000))
+
+def benchmark_bulk(db, row_count):
+    ''' Compares inserting and updating tasks one row at a time with the
+        bulk insert and update methods.
+        
+        Args:
+            db (:class:`application.database.Database`): The database.
+            
+            row_count (int): The number of tasks to write. '''
+    
+    project = create_project(db)
+    
+    try:
+        # Writing one row per commit is slow, so fewer rows are used.
+        single_count = min(row_count, 2000)
+        tasks = create_tasks(project.id, single_count)
+        
+        start = time.perf_counter()
+        
+        for task in tasks:
+            db.insert_task(task)
+        
+        report('insert_task', single_count, time.perf_counter() - start)
+        db.delete_project(project.id)
+        
+        project = create_project(db)
+        tasks = create_tasks(project.id, row_count)
+        
+        start = time.perf_counter()
+        errors = db.insert_tasks(tasks)
+        report('insert_tasks', row_count - len(errors),
+               time.perf_counter() - start)
+        
+        tasks = db.load_tasks(project.id)
+        
+        for task in tasks:
+            task.description = 'Updated by benchmark.py.'
+        
+        start = time.perf_counter()
+        errors = db.update_tasks(tasks)
+        report('update_tasks', len(tasks) - len(errors),
+               time.perf_counter() - start)
+    finally:
+        db.delete_project(project.id)
+
+def benchmark_prepared(db, call_count):
+    ''' Compares the latency of the load_project and load_task queries 
+        sent as text with the same queries run as prepared statements.
+        
+        Args:
+            db (:class:`application.database.PostgreSQL`): The database.
+            
+            call_count (int): The number of calls of each query. '''
+    
+    project = create_project(db)
+    
+    try:
+        db.insert_tasks(create_tasks(project.id, 1))
+        task = db.load_tasks(project.id)[0]
+        
+        for use_prepared_statements in (False, True):
+            db.use_prepared_statements = use_prepared_statements
+            mode = 'prepared' if use_prepared_statements else 'text'
+            
+            # Warm up the connection (and prepare the statements).
+            db.load_project(project.id)
+            db.load_task(project.id, task.id)
+            
+            start = time.perf_counter()
+            
+            for call in range(call_count):
+                db.load_project(project.id)
+            
+            report_latency('load_project (' + mode + ')', call_count, 
+                           time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            
+            for call in range(call_count):
+                db.load_task(project.id, task.id)
+            
+            report_latency('load_task (' + mode + ')', call_count, 
+                           time.perf_counter() - start)
+    finally:
+        db.use_prepared_statements = True
+        db.delete_project(project.id)
+
+def validated_task(row):
+    ''' Converts a task row to a Task object through the validating 
+        setters, the way the loaders did before :meth:`Task.from_row`.
+        
+        Args:
+            row (tuple): The columns of a task.
+        
+        Returns:
+            A :class:`application.model.Task` object. '''
+    
+    from application.model import Complexity, Status, Task
+    
+    task = Task()
+    task.id = row[0]
+    task.project_id = row[1]
+    task.name = row[2]
+    task.brief_description = row[3]
+    task.description = row[4]
+    
+    try:
+        task.complexity = Complexity(row[5])
+    except(ValueError):
+        task.complexity = Complexity.UNKNOWN
+    
+    task.due_date = row[6]
+    
+    try:
+        task.status = Status(row[7])
+    except(ValueError):
+        task.status = Status.UNKNOWN
+    
+    return task
+
+def benchmark_rows(row_count):
+    ''' Compares converting task rows to Task objects through the 
+        validating setters with the trusted :meth:`Task.from_row` path. 
+        The rows are generated, so no database is needed.
+        
+        Args:
+            row_count (int): The number of rows to convert. '''
+    
+    from application.model import Task
+    
+    rows = [(task_number + 1, 1, task.name, task.brief_description, 
+             task.description, task.complexity.value, task.due_date, 
+             task.status.value) 
+            for task_number, task in enumerate(create_tasks(1, row_count))]
+    
+    start = time.perf_counter()
+    [validated_task(row) for row in rows]
+    report('rows (validated)', row_count, time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    list(map(Task.from_row, rows))
+    report('rows (from_row)', row_count, time.perf_counter() - start)
+
+def benchmark_memory(object_count):
+    ''' Reports the memory each Project, Task and Login object takes. The 
+        objects share their attribute values, so only the objects 
+        themselves are measured. No database is needed.
+        
+        Args:
+            object_count (int): The number of objects of each class to 
+            create. '''
+    
+    from application.model import Complexity, Login, Project, Status, Task
+    
+    rows = {
+        Project: (1, 'Project', 'Brief description', 'Description'),
+        Task: (1, 1, 'Task', 'Brief description', 'Description', 
+               Complexity.LOW.value, datetime(2014, 1, 1), 
+               Status.NOT_STARTED.value),
+        Login: (1, 'username', 'password')
+        }
+    
+    for model_class, row in rows.items():
+        objects = [None] * object_count
+        
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        
+        for number in range(object_count):
+            objects[number] = model_class.from_row(row)
+        
+        size = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+        
+        print('%-30s %8d objects %10d bytes %8.1f bytes/object' %
+              (model_class.__name__, object_count, size, 
+               size / object_count))
+
+# Run by each worker process of the startup benchmark. It is passed the 
+# time the process was started, imports the application and requests the 
+# login form, then prints the seconds the import, the first request and the 
+# whole startup took.
+STARTUP_SCRIPT = '''
+import sys
+import time
+
+started = float(sys.argv[1])
+start = time.time()
+
+from application.projectmanagement import app
+
+imported = time.time()
+response = app.test_client().get('/login')
+responded = time.time()
+
+if response.status_code != 200:
+    sys.exit('The login form returned %d.' % response.status_code)
+
+print(imported - start, responded - imported, responded - started)
+'''
+
+def start_worker(template_cache_dir):
+    ''' Starts a worker process of the startup benchmark and waits for its 
+        first response. The login form does not use the database, and the 
+        memory database is configured so that no database server is 
+        needed.
+        
+        Args:
+            template_cache_dir (str): The directory of the template 
+            bytecode cache. An empty string disables the cache.
+        
+        Returns:
+            A (import, first request, time to first response) tuple of 
+            seconds. '''
+    
+    environment = dict(os.environ, 
+                       DATABASE_URL='memory://benchmark:benchmark@/startup', 
+                       SECRET_KEY='benchmark', DEBUG='', 
+                       TEMPLATE_CACHE_DIR=template_cache_dir)
+    output = subprocess.check_output(
+        [sys.executable, '-c', STARTUP_SCRIPT, repr(time.time())], 
+        env=environment, cwd=os.path.dirname(os.path.abspath(__file__)))
+    
+    return tuple(float(value) for value in output.split())
+
+def benchmark_startup(run_count):
+    ''' Reports the time from starting a worker process to its first 
+        response, without the template bytecode cache, with an empty cache 
+        and with a cache warmed by an earlier process. Each run starts a 
+        new interpreter, so the templates are compiled or loaded again.
+        
+        Args:
+            run_count (int): The number of worker processes to start for 
+            each case. '''
+    
+    directory = tempfile.mkdtemp()
+    warm_directory = os.path.join(directory, 'warm')
+    
+    try:
+        start_worker(warm_directory)
+        
+        cases = [
+            ('startup (no cache)', lambda run: ''), 
+            ('startup (cold cache)', 
+             lambda run: os.path.join(directory, 'cold%d' % run)), 
+            ('startup (warm cache)', lambda run: warm_directory)
+            ]
+        
+        for name, template_cache_dir in cases:
+            times = [start_worker(template_cache_dir(run)) 
+                     for run in range(run_count)]
+            
+            print('%-30s %8d runs %8.1f ms import %8.1f ms request '
+                  '%8.1f ms first response' % 
+                  ((name, run_count) + 
+                   tuple(sum(values) / run_count * 1000 
+                         for values in zip(*times))))
+    finally:
+        shutil.rmtree(directory)
+
+def open_database():
+    ''' Opens the configured database without the entity cache, so every 
+        call reaches the database.
+        
+        Returns:
+            An open :class:`application.database.Database`. '''
+    
+    from application import database
+    from application.projectmanagement import app
+    
+    db = database.get_database_from_url(app.config['DATABASE_URL'])
+    db.open()
+    
+    return db
+
+if __name__ == '__main__':
+    from projectmanagement import load_config_file
+    
+    load_config_file()
+    
+    if len(sys.argv) == 3 and sys.argv[1] == '-rows':
+        benchmark_rows(int(sys.argv[2]))
+        sys.exit(0)
+    
+    if len(sys.argv) == 3 and sys.argv[1] == '-memory':
+        benchmark_memory(int(sys.argv[2]))
+        sys.exit(0)
+    
+    if len(sys.argv) == 3 and sys.argv[1] == '-startup':
+        benchmark_startup(int(sys.argv[2]))
+        sys.exit(0)
+    
+    benchmarks = {
+        '-bulk': benchmark_bulk,
+        '-prepared': benchmark_prepared
+        }
+    
+    if len(sys.argv) == 3 and sys.argv[1] in benchmarks:
+        db = open_database()
+        
+        try:
+            benchmarks[sys.argv[1]](db, int(sys.argv[2]))
+        finally:
+            db.close()
+        
+        sys.exit(0)
+    
+    print('benchmark.py')
+    print('Bulk Writes: benchmark.py -bulk ROWS')
+    print('Prepared Statements: benchmark.py -prepared CALLS')
+    print('Row Conversion: benchmark.py -rows ROWS')
+    print('Model Memory: benchmark.py -memory OBJECTS')
+    print('Worker Startup: benchmark.py -startup RUNS')
+    sys.exit(1)
@@ -23,26 +23,107 @@ def load_config_file():
     os.environ['DATABASE_URL'] = config['Configuration']['DATABASE_URL']
     os.environ['DEBUG'] = config['Configuration']['DEBUG']
     
+    # The connection pool, replica, page size, cache, fragment cache, 
+    # template cache and password hashing settings are optional.
+    for key in ('DATABASE_POOL_MIN_SIZE', 'DATABASE_POOL_MAX_SIZE', 
+                'DATABASE_POOL_TIMEOUT', 'DATABASE_POOL_MAX_IDLE_TIME', 
+                'DATABASE_REPLICA_URLS', 'DATABASE_PRIMARY_STICKINESS', 
+                'PAGE_SIZE', 'CACHE_SIZE', 'CACHE_TIME_TO_LIVE', 
+                'FRAGMENT_CACHE_SIZE', 'FRAGMENT_CACHE_TIME_TO_LIVE', 
+                'FRAGMENT_CACHE_SERVERS', 'TEMPLATE_CACHE_DIR', 
+                'PASSWORD_HASH_ITERATIONS', 'PASSWORD_VERIFY_WORKERS', 
+                'PASSWORD_VERIFY_QUEUE_SIZE'):
+        if key in config['Configuration']:
+            os.environ[key] = config['Configuration'][key]
+    
 
 if __name__ == '__main__':
     load_config_file()
     
-    from application.projectmanagement import app, initialize_database
+    from application.projectmanagement import app, build_assets, \
+        initialize_database, migrate_database, rebuild_project_statistics, \
+        verify_project_statistics, warm_templates
     
     if len(sys.argv) == 1:
         # No command line arguments. Run the server.
         app.run()
         sys.exit(0)
+    elif len(sys.argv) == 2:
+        if sys.argv[1] == '-migrate':
+            # Apply the database schema migrations.
+            applied = migrate_database()
+            
+            for name in applied:
+                print('Applied migration ' + name + '.')
+            
+            if not applied:
+                print('The database schema is up to date.')
+            
+            sys.exit(0)
+        elif sys.argv[1] == '-rebuildstatistics':
+            # Rebuild the project statistics after a bulk load.
+            count = rebuild_project_statistics()
+            print('Rebuilt the statistics of %d projects.' % count)
+            sys.exit(0)
+        elif sys.argv[1] == '-verifystatistics':
+            # Check the project statistics against the tasks.
+            project_ids = verify_project_statistics()
+            
+            for project_id in project_ids:
+                print('The statistics of project %d are out of date.' % 
+                      project_id)
+            
+            if not project_ids:
+                print('The project statistics are up to date.')
+            
+            sys.exit(1 if project_ids else 0)
+        elif sys.argv[1] == '-warmtemplates':
+            # Compile the templates into the bytecode cache.
+            names = warm_templates()
+            
+            if names is None:
+                print('The template cache is disabled.')
+                sys.exit(1)
+            
+            print('Compiled %d templates.' % len(names))
+            sys.exit(0)
+        elif sys.argv[1] == '-buildassets':
+            # Minify, fingerprint and compress the static assets.
+            manifest = build_assets()
+            
+            for name in sorted(manifest):
+                print('Built ' + name + ' as ' + manifest[name] + '.')
+            
+            sys.exit(0)
+    elif len(sys.argv) == 3:
+        if sys.argv[1] == '-calibratepasswords':
+            # Pick the password hash iterations for a verification time.
+            from application.passwords import calibrate_iterations
+            
+            milliseconds = float(sys.argv[2])
+            iterations = calibrate_iterations(milliseconds / 1000)
+            
+            print('PASSWORD_HASH_ITERATIONS=%d (about %g ms per login on '
+                  'this machine)' % (iterations, milliseconds))
+            sys.exit(0)
     elif len(sys.argv) == 4:
         if sys.argv[1] == '-initializedatabase':
             # Initialize the database.
             username = sys.argv[2]
             password = sys.argv[3]
             
-            initialize_database(username, password)
+            for name in initialize_database(username, password):
+                print('Applied migration ' + name + '.')
+            
             sys.exit(0)
     
     print('projectmanagement.py')
     print('Run Server: projectmanagement.py')
     print('Initialize Database: projectmanagement.py -initializedatabase username password')
+    print('Migrate Database: projectmanagement.py -migrate')
+    print('Rebuild Project Statistics: projectmanagement.py -rebuildstatistics')
+    print('Verify Project Statistics: projectmanagement.py -verifystatistics')
+    print('Calibrate Password Hashing: projectmanagement.py -calibratepasswords milliseconds')
+    print('Warm Template Cache: projectmanagement.py -warmtemplates')
+    print('Build Static Assets: projectmanagement.py -buildassets')
     sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,147 @@
+# File: test_database.py
+# Description: Tests the bulk writes of the database implementations.
+# Date: 2026/10/18
+
+''' Tests the bulk task updates of the database implementations. The
+    memory database is always tested. The PostgreSQL database is tested
+    when TEST_DATABASE_URL names a scratch database, which the tests
+    initialize and add their own projects to. Run the tests from the
+    repository root with ``python -m unittest discover tests``. '''
+
+from datetime import datetime
+import os
+import time
+import unittest
+
+from application.database import DuplicateNameError, MemoryDatabase, \
+    NotFoundError, get_database_from_url
+from application.model import Project, Task
+
+class UpdateTasksTests:
+    ''' Tests :meth:`Database.update_tasks` against the database returned
+        by :meth:`create_database`. '''
+    
+    def create_database(self):
+        ''' Provides the database to test. '''
+        
+        raise NotImplementedError()
+    
+    def setUp(self):
+        ''' Adds a project with three tasks. '''
+        
+        self.db = self.create_database()
+        self.db.open()
+        
+        project = Project()
+        project.name = 'Test %f' % time.time()
+        project.brief_description = 'Test project'
+        project.description = 'Generated by test_database.py.'
+        
+        self.db.insert_project(project)
+        
+        self.project = [current_project
+                        for current_project in self.db.load_projects()
+                        if current_project.name == project.name][0]
+        
+        for number in range(3):
+            task = Task()
+            task.project_id = self.project.id
+            task.name = 'Task %d' % number
+            task.brief_description = 'Test task'
+            task.description = 'Generated by test_database.py.'
+            task.due_date = datetime(2014, 1, 1)
+            
+            self.db.insert_task(task)
+        
+        self.tasks = sorted(self.db.load_tasks(self.project.id),
+                            key=lambda task: task.name)
+    
+    def tearDown(self):
+        ''' Deletes the project and its tasks. '''
+        
+        self.db.delete_project(self.project.id)
+        self.db.close()
+    
+    def create_missing_task(self):
+        ''' Provides a task whose id does not exist in the project. '''
+        
+        task = Task()
+        task.id = max(task.id for task in self.tasks) + 1000000
+        task.project_id = self.project.id
+        task.name = 'Missing task'
+        task.brief_description = 'Test task'
+        task.description = 'Generated by test_database.py.'
+        task.due_date = datetime(2014, 1, 1)
+        
+        return task
+    
+    def load_names(self):
+        ''' Provides the sorted names of the project's tasks. '''
+        
+        tasks = self.db.load_tasks(self.project.id)
+        
+        return sorted(task.name for task in tasks)
+    
+    def test_missing_task_is_reported(self):
+        ''' A task that does not exist is reported by its position and the
+            other tasks are updated. '''
+        
+        self.tasks[0].name = 'Renamed 0'
+        self.tasks[2].name = 'Renamed 2'
+        tasks = [self.tasks[0], self.create_missing_task(), self.tasks[2]]
+        
+        errors = self.db.update_tasks(tasks, batch_size=2)
+        
+        self.assertEqual([index for index, error in errors], [1])
+        self.assertIsInstance(errors[0][1], NotFoundError)
+        self.assertEqual(self.load_names(),
+                         ['Renamed 0', 'Renamed 2', 'Task 1'])
+    
+    def test_missing_task_is_reported_with_failed_rows(self):
+        ''' A task that does not exist is reported when a failed row makes
+            the batch be written one row at a time. '''
+        
+        self.tasks[0].name = 'Task 1'
+        self.tasks[2].name = 'Renamed 2'
+        tasks = [self.tasks[0], self.create_missing_task(), self.tasks[2]]
+        
+        errors = self.db.update_tasks(tasks)
+        
+        self.assertEqual([index for index, error in errors], [0, 1])
+        self.assertIsInstance(errors[0][1], DuplicateNameError)
+        self.assertIsInstance(errors[1][1], NotFoundError)
+        self.assertEqual(self.load_names(),
+                         ['Renamed 2', 'Task 0', 'Task 1'])
+
+class MemoryDatabaseUpdateTasksTests(UpdateTasksTests, unittest.TestCase):
+    ''' Tests the bulk task updates of :class:`MemoryDatabase`. '''
+    
+    def create_database(self):
+        ''' Provides the database to test. '''
+        
+        return MemoryDatabase('test_database')
+
+@unittest.skipUnless(os.environ.get('TEST_DATABASE_URL'),
+                     'TEST_DATABASE_URL is not set')
+class PostgreSQLUpdateTasksTests(UpdateTasksTests, unittest.TestCase):
+    ''' Tests the bulk task updates of :class:`PostgreSQL`. '''
+    
+    @classmethod
+    def setUpClass(cls):
+        ''' Creates the schema of the scratch database. '''
+        
+        db = get_database_from_url(os.environ['TEST_DATABASE_URL'])
+        db.open()
+        
+        try:
+            db.initialize_database('test', 'test')
+        finally:
+            db.close()
+    
+    def create_database(self):
+        ''' Provides the database to test. '''
+        
+        return get_database_from_url(os.environ['TEST_DATABASE_URL'])
+
+if __name__ == '__main__':
+    unittest.main()